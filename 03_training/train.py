@@ -1,6 +1,35 @@
 import os  # Import OS library for managing file paths and environment variables
-# Disable GPU for training/inference stability on some envs to prevent CUDA errors
-os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+# GPUs are used when available so the LSTM layers can run on the fused cuDNN kernel.
+# Set UPI_FORCE_CPU=1 to fall back to CPU-only training on hosts with broken CUDA setups.
+if os.environ.get('UPI_FORCE_CPU', '0') == '1':
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+
+# XGBoost's hist method stops scaling past ~8 threads and SMT siblings only add
+# contention, so cap the OpenMP pool at the physical core count (max 8).
+# These must be set before xgboost is imported; explicit env overrides win.
+XGB_MAX_THREADS = 8
+
+
+def physical_cores():
+    """Return the number of physical CPU cores available to this process."""
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except ImportError:
+        pass
+    try:
+        logical = len(os.sched_getaffinity(0))
+    except AttributeError:
+        logical = os.cpu_count() or 1
+    return max(1, logical // 2)
+
+
+XGB_THREADS = min(physical_cores(), XGB_MAX_THREADS)
+os.environ.setdefault('OMP_NUM_THREADS', str(XGB_THREADS))
+os.environ.setdefault('OMP_PLACES', 'cores')
+os.environ.setdefault('OMP_PROC_BIND', 'close')
 
 import pandas as pd  # Import pandas for processing CSV datasets
 import numpy as np   # Import numpy for numerical array handling
@@ -9,12 +38,17 @@ from tensorflow.keras.models import Sequential  # Import Sequential for stacking
 from tensorflow.keras.layers import LSTM, Dense, Dropout, Input  # Import specific neural layers for the sequence model
 from tensorflow.keras.optimizers import Adam  # Import Adam optimizer for efficient gradient descent
 import xgboost as xgb  # Import XGBoost for training gradient boosted decision trees
-from sklearn.model_selection import train_test_split  # Import tool to split data into training/testing sets
-from sklearn.metrics import roc_auc_score, accuracy_score, precision_score, recall_score, f1_score  # Import evaluation metrics
-import joblib  # Import joblib for saving non-Keras models like XGBoost
+from sklearn.model_selection import StratifiedShuffleSplit  # Import tool to split data into training/testing sets
 import yaml    # Import yaml for reading configuration files
 import json    # Import json for saving performance metrics in a readable format
+import csv     # Import csv for reading the raw data header
+import hashlib # Import hashlib for keying the processed-feature cache
 import sys     # Import sys for path manipulation
+import time    # Import time for benchmarking XGBoost thread counts
+import threading  # Import threading for writing debug splits in the background
+import multiprocessing  # Import multiprocessing for the spawn start method
+from multiprocessing import shared_memory  # Import shared memory to hand arrays to worker processes
+from concurrent.futures import ProcessPoolExecutor  # Import process pool for concurrent model training
 
 # Add project root to path so we can import 'utils'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -22,9 +56,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.preprocessing import Preprocessor  # Import our custom data preparation logic
 from utils.logger import setup_logger         # Import our logging utility
 from utils.security import generate_checksums_for_directory  # Import security utilities
+from utils.inference import compile_lstm_inference, export_lstm_onnx  # Import the compiled LSTM forward pass and ONNX export
+from utils.config import load_yaml_config  # Import the cached YAML config loader
 
 logger = setup_logger()  # Initialize the logger for the training script
 
+# Allocate GPU memory on demand instead of reserving the whole device up front
+for _gpu in tf.config.list_physical_devices('GPU'):
+    try:
+        tf.config.experimental.set_memory_growth(_gpu, True)
+    except RuntimeError as e:
+        logger.warning(f"Could not enable memory growth on {_gpu.name}: {str(e)}")
+
 
 def load_config(path="07_configs/config.yaml"):
     """
@@ -41,8 +84,7 @@ def load_config(path="07_configs/config.yaml"):
         yaml.YAMLError: If config file is invalid
     """
     try:
-        with open(path, 'r') as f:
-            return yaml.safe_load(f)
+        return load_yaml_config(path)
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {path}")
         raise
@@ -51,6 +93,110 @@ def load_config(path="07_configs/config.yaml"):
         raise
 
 
+def load_raw_transactions(path, config):
+    """
+    Read the raw transaction CSV, keeping only the columns the pipeline uses.
+    
+    Uses PyArrow's multithreaded CSV reader when it is installed and falls
+    back to pandas' C parser otherwise. Raw numerical features are parsed
+    straight to float32 and the label to int8.
+    
+    Args:
+        path (str): Path to the raw CSV file
+        config (dict): Configuration parameters
+        
+    Returns:
+        pd.DataFrame: Raw transactions
+        
+    Raises:
+        FileNotFoundError: If the CSV file does not exist
+    """
+    with open(path, 'r', newline='') as f:
+        header = next(csv.reader(f))
+    numerical = set(config['features']['numerical'])
+    wanted = numerical | set(config['features']['categorical']) | {'Timestamp', 'IsFraud'}
+    # Derived features (Hour, TimeDiff, ...) are not in the file and are built by the Preprocessor
+    columns = [c for c in header if c in wanted]
+    float_cols = [c for c in columns if c in numerical]
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+    except ImportError:
+        dtypes = {c: np.float32 for c in float_cols}
+        if 'IsFraud' in columns:
+            dtypes['IsFraud'] = np.int8
+        return pd.read_csv(path, usecols=columns, dtype=dtypes)
+    
+    column_types = {c: pa.float32() for c in float_cols}
+    if 'IsFraud' in columns:
+        column_types['IsFraud'] = pa.int8()
+    table = pv.read_csv(
+        path,
+        convert_options=pv.ConvertOptions(include_columns=columns, column_types=column_types)
+    )
+    return table.to_pandas()
+
+
+def feature_cache_key(config):
+    """
+    Build the cache key for processed features.
+    
+    The key is a BLAKE2b digest of the raw CSV contents plus the feature and
+    sequence settings that affect preprocessing, so any change to either
+    produces a new cache entry.
+    
+    Args:
+        config (dict): Configuration parameters
+        
+    Returns:
+        str: Hex digest identifying the processed feature set
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(config['paths']['raw_data'], 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+    settings = {'features': config['features'], 'lookback': config['data']['lookback']}
+    hasher.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def save_cached_features(cache_dir, X_lstm, X_xgb, y):
+    """
+    Save processed feature arrays as .npy files.
+    
+    Args:
+        cache_dir (str): Cache entry directory
+        X_lstm (np.ndarray): LSTM sequences
+        X_xgb (np.ndarray): XGBoost features
+        y (np.ndarray): Labels
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(os.path.join(cache_dir, 'X_lstm.npy'), X_lstm, allow_pickle=False)
+    np.save(os.path.join(cache_dir, 'X_xgb.npy'), X_xgb, allow_pickle=False)
+    # Labels are written last so a complete y.npy marks a complete cache entry
+    np.save(os.path.join(cache_dir, 'y.npy'), y, allow_pickle=False)
+
+
+def load_cached_features(cache_dir):
+    """
+    Memory-map cached feature arrays.
+    
+    The arrays are opened read-only with mmap_mode='r', so pages are read
+    from disk on demand instead of being copied into RAM up front.
+    
+    Args:
+        cache_dir (str): Cache entry directory
+        
+    Returns:
+        tuple: (X_lstm, X_xgb, y) memory-mapped arrays
+    """
+    return tuple(
+        np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r', allow_pickle=False)
+        for name in ('X_lstm', 'X_xgb', 'y')
+    )
+
+
 def build_lstm(input_shape, config):
     """
     Function to define the architecture of the deep learning LSTM model.
@@ -58,6 +204,14 @@ def build_lstm(input_shape, config):
     Creates a sequential neural network with LSTM layers for sequence modeling,
     dropout for regularization, and dense layers for output.
     
+    Layers follow the global Keras dtype policy (see configure_precision) except
+    the output layer, which always computes in float32.
+    
+    Both LSTM layers keep the cuDNN-compatible settings (tanh/sigmoid activations,
+    no recurrent dropout, no unrolling, with bias) so Keras dispatches them to the
+    fused cuDNN kernel when a GPU is present. Dropout is applied between layers
+    rather than inside the LSTM for the same reason.
+    
     Args:
         input_shape (tuple): Shape of input data (lookback_steps, n_features)
         config (dict): Model configuration parameters
@@ -65,124 +219,280 @@ def build_lstm(input_shape, config):
     Returns:
         tf.keras.Model: Compiled LSTM model ready for training
     """
+    # Settings required for the fused cuDNN LSTM kernel
+    cudnn_kwargs = dict(
+        activation='tanh',
+        recurrent_activation='sigmoid',
+        recurrent_dropout=0.0,
+        unroll=False,
+        use_bias=True
+    )
+    
     model = Sequential([
         Input(shape=input_shape),
-        LSTM(config['model']['lstm']['units_1'], return_sequences=True),
+        LSTM(config['model']['lstm']['units_1'], return_sequences=True, **cudnn_kwargs),
         Dropout(config['model']['lstm']['dropout']),
-        LSTM(config['model']['lstm']['units_2']),
+        LSTM(config['model']['lstm']['units_2'], **cudnn_kwargs),
         Dropout(config['model']['lstm']['dropout']),
         Dense(16, activation='relu'),
-        Dense(1, activation='sigmoid')
+        # Keep the output in float32 so the sigmoid cannot under/overflow under mixed precision
+        Dense(1, activation='sigmoid', dtype='float32')
     ])
     
+    optimizer = Adam(learning_rate=config['model']['lstm']['learning_rate'])
+    if tf.keras.mixed_precision.global_policy().name == 'mixed_float16':
+        # float16 gradients need loss scaling to avoid underflow
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+    
     model.compile(
-        optimizer=Adam(learning_rate=config['model']['lstm']['learning_rate']),
+        optimizer=optimizer,
         loss='binary_crossentropy',
         metrics=['accuracy']
     )
     return model
 
 
-def generate_model_checksums(artifacts_dir):
+def autotune_xgb_threads(X, y, params, candidates=(1, 2, 4, 8, 16), num_rounds=100, max_rows=50000):
     """
-    Generate SHA256 checksums for all saved model files.
+    Pick the fastest XGBoost thread count by timing short training runs.
     
-    This function creates a checksums.json file that can be used
-    to verify model integrity during inference.
+    Trains `num_rounds` boosting rounds on a subset of the data for every
+    candidate thread count (capped at the logical CPUs available) and
+    returns the one with the lowest wall time.
     
     Args:
-        artifacts_dir (str): Directory containing model files
+        X (np.ndarray): Training features
+        y (np.ndarray): Training labels
+        params (dict): XGBoost training parameters
+        candidates (tuple): Thread counts to try
+        num_rounds (int): Boosting rounds per timing run
+        max_rows (int): Maximum number of rows used for timing
         
     Returns:
-        dict: Dictionary of filenames to checksums
+        int: Fastest thread count
     """
-    checksums_file = os.path.join(artifacts_dir, 'checksums.json')
+    max_threads = os.cpu_count() or 1
+    candidates = [n for n in candidates if n <= max_threads] or [1]
     
-    try:
-        checksums = generate_checksums_for_directory(
-            directory=artifacts_dir,
-            output_file=checksums_file,
-            pattern='*'
-        )
-        logger.info(f"Generated checksums for {len(checksums)} files in {artifacts_dir}")
-        return checksums
-    except Exception as e:
-        logger.error(f"Failed to generate checksums: {str(e)}")
-        return {}
+    dsub = xgb.QuantileDMatrix(X[:max_rows], label=y[:max_rows], max_bin=params.get('max_bin', 255))
+    timings = {}
+    for n in candidates:
+        start = time.perf_counter()
+        xgb.train({**params, 'nthread': n}, dsub, num_boost_round=num_rounds)
+        timings[n] = time.perf_counter() - start
+    
+    best = min(timings, key=timings.get)
+    logger.info(f"XGBoost thread timings: {timings} -> using nthread={best}")
+    return best
 
 
-def train():
+def fit_xgb_booster(X, y, params, num_rounds, device='cpu', X_val=None, y_val=None,
+                    early_stopping_rounds=None):
     """
-    Main orchestration function for the model training pipeline.
+    Train an XGBoost booster on a QuantileDMatrix on the given device.
     
-    This function performs the complete training workflow:
-    1. Loads and preprocesses data
-    2. Creates sequences for LSTM
-    3. Splits data into train/test sets
-    4. Trains LSTM and XGBoost models
-    5. Saves models and generates checksums for security
-    6. Evaluates and saves metrics
+    On CUDA the arrays are moved to the GPU once via cupy (when installed)
+    so the QuantileDMatrix is built directly from device memory. When a
+    validation set is given, training stops once the validation loss has not
+    improved for `early_stopping_rounds` rounds and the booster is trimmed
+    to its best iteration.
     
-    Raises:
-        FileNotFoundError: If data file does not exist
-        RuntimeError: If training fails
+    Args:
+        X (np.ndarray): Training features
+        y (np.ndarray): Training labels
+        params (dict): XGBoost training parameters
+        num_rounds (int): Maximum number of boosting rounds
+        device (str): 'cpu' or 'cuda'
+        X_val (np.ndarray, optional): Validation features
+        y_val (np.ndarray, optional): Validation labels
+        early_stopping_rounds (int, optional): Patience for early stopping
+        
+    Returns:
+        xgb.Booster: Trained booster
     """
-    config = load_config()
+    if device == 'cuda':
+        try:
+            import cupy
+            X, y = cupy.asarray(X), cupy.asarray(y)
+            if X_val is not None:
+                X_val, y_val = cupy.asarray(X_val), cupy.asarray(y_val)
+        except ImportError:
+            logger.info("cupy not installed; XGBoost will copy host arrays to the GPU")
     
-    # 1. Load Data
-    logger.info("Loading data...")
-    try:
-        df = pd.read_csv(config['paths']['raw_data'])
-        logger.info(f"Loaded {len(df)} records from {config['paths']['raw_data']}")
-    except FileNotFoundError:
-        logger.error(f"Data file not found: {config['paths']['raw_data']}")
-        raise
+    dtrain = xgb.QuantileDMatrix(X, label=y, max_bin=params['max_bin'])
+    if X_val is None:
+        return xgb.train({**params, 'device': device}, dtrain, num_boost_round=num_rounds)
     
-    # 2. Preprocess
-    logger.info("Preprocessing data...")
-    preprocessor = Preprocessor()
-    df_processed = preprocessor.fit_transform(df)
-    logger.info(f"Preprocessing complete. Shape: {df_processed.shape}")
+    # Validation data reuses the training bin boundaries
+    dval = xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain, max_bin=params['max_bin'])
+    booster = xgb.train(
+        {**params, 'device': device}, dtrain,
+        num_boost_round=num_rounds,
+        evals=[(dval, 'val')],
+        early_stopping_rounds=early_stopping_rounds,
+        verbose_eval=False
+    )
+    logger.info(
+        f"XGBoost early stopping: best iteration {booster.best_iteration + 1} of {num_rounds}"
+    )
+    # Drop the trees after the best iteration - smaller model, faster inplace_predict
+    return booster[:booster.best_iteration + 1]
+
+
+def configure_precision(config):
+    """
+    Set the global Keras dtype policy for LSTM training.
     
-    # 3. Create Sequences
-    logger.info("Creating sequences for LSTM...")
-    X_lstm, X_xgb, y = preprocessor.create_sequences(df_processed)
-    logger.info(f"Sequence shapes - LSTM: {X_lstm.shape}, XGB: {X_xgb.shape}")
+    `model.lstm.precision` may be 'auto', 'float32', 'mixed_float16' or
+    'mixed_bfloat16'. 'auto' uses mixed_float16 when a GPU is visible and
+    float32 otherwise, since bfloat16 is only faster on CPUs with native
+    BF16 support.
     
-    # 4. Split Data
-    logger.info("Splitting data into train/test sets...")
-    X_lstm_train, X_lstm_test, X_xgb_train, X_xgb_test, y_train, y_test = train_test_split(
-        X_lstm, X_xgb, y,
-        test_size=config['data']['test_split'],
-        random_state=42,
-        stratify=y
-    )
-    logger.info(f"Train size: {len(y_train)}, Test size: {len(y_test)}")
+    Args:
+        config (dict): Configuration parameters
+        
+    Returns:
+        str: Name of the policy that was applied
+    """
+    policy = config['model']['lstm'].get('precision', 'auto')
+    if policy == 'auto':
+        policy = 'mixed_float16' if tf.config.list_physical_devices('GPU') else 'float32'
+    tf.keras.mixed_precision.set_global_policy(policy)
+    logger.info(f"Keras dtype policy: {policy}")
+    return policy
+
+
+def make_lstm_dataset(X, y, sample_weights, batch_size, shuffle=True):
+    """
+    Build a tf.data input pipeline for LSTM training.
     
-    # Save training splits for debugging
-    os.makedirs(config['paths']['processed_data'], exist_ok=True)
-    np.save(os.path.join(config['paths']['processed_data'], 'X_xgb_train.npy'), X_xgb_train)
+    Shuffling, batching and prefetching happen inside the tf.data runtime so
+    the next batch is prepared while the current one is being trained on.
     
-    # Ensure artifacts directory exists
-    os.makedirs(config['paths']['artifacts'], exist_ok=True)
+    Args:
+        X (np.ndarray): Sequences of shape (samples, lookback, features)
+        y (np.ndarray): Labels
+        sample_weights (np.ndarray): Per-sample loss weights, or None
+        batch_size (int): Batch size
+        shuffle (bool): Shuffle every epoch and drop the last partial batch
+        
+    Returns:
+        tf.data.Dataset: Batched (x, y[, weight]) dataset
+    """
+    tensors = (X.astype(np.float32, copy=False), y.astype(np.float32, copy=False))
+    if sample_weights is not None:
+        tensors += (sample_weights,)
+    ds = tf.data.Dataset.from_tensor_slices(tensors)
+    if shuffle:
+        ds = ds.shuffle(8192, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size, drop_remainder=shuffle)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def export_tflite(model, path):
+    """
+    Export a Keras model to TFLite with int8 weight quantization.
+    
+    Uses dynamic-range quantization (tf.lite.Optimize.DEFAULT): weights are
+    stored as int8 and activations stay float, giving a ~4x smaller model
+    that runs faster on CPU.
+    
+    Args:
+        model (tf.keras.Model): Trained model
+        path (str): Destination .tflite file
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    with open(path, 'wb') as f:
+        f.write(converter.convert())
+
+
+def aligned_empty(shape, dtype, align=64):
+    """
+    Allocate an uninitialized array whose data starts on an `align`-byte boundary.
+    
+    NumPy only guarantees 16-byte alignment; 64 bytes matches a cache line and
+    an AVX-512 register, so SIMD kernels avoid split loads.
+    
+    Args:
+        shape (tuple): Array shape
+        dtype (np.dtype): Array dtype
+        align (int): Alignment in bytes
+        
+    Returns:
+        np.ndarray: Aligned, C-contiguous array
+    """
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(size + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset:offset + size].view(dtype).reshape(shape)
+
+
+def take_aligned(arr, indices):
+    """Gather rows of `arr` directly into a 64-byte aligned buffer."""
+    out = aligned_empty((len(indices),) + arr.shape[1:], arr.dtype)
+    return np.take(arr, indices, axis=0, out=out)
+
+
+def class_counts(y):
+    """
+    Count negative and positive labels in a 0/1 label array.
+    
+    Args:
+        y (np.ndarray): Binary labels
+        
+    Returns:
+        tuple: (neg, pos) counts
+    """
+    # Labels are 0/1, so a single sum gives both class counts
+    pos = int(y.sum())
+    return y.size - pos, pos
+
+
+def train_lstm(X_lstm_train, y_train, config):
+    """
+    Train the LSTM model and save it to the artifacts directory.
     
-    # 5. Train LSTM
+    Args:
+        X_lstm_train (np.ndarray): Training sequences (samples, lookback, features)
+        y_train (np.ndarray): Training labels
+        config (dict): Configuration parameters
+        
+    Returns:
+        tf.keras.Model: Trained LSTM model
+        
+    Raises:
+        RuntimeError: If training fails
+    """
     logger.info("Training LSTM model...")
-    neg = np.sum(y_train == 0)
-    pos = np.sum(y_train == 1)
+    neg, pos = class_counts(y_train)
     total = neg + pos
     class_weight = {0: (1/neg)*(total/2.0), 1: (1/pos)*(total/2.0)}
     logger.info(f"Class distribution - Non-fraud: {neg}, Fraud: {pos}")
     
+    # Class weights become per-sample weights so weighting happens inside the input pipeline
+    sample_weights = np.where(y_train == 1, class_weight[1], class_weight[0]).astype(np.float32)
+    
+    # Hold out the last 10% of the training set for (unweighted) validation
+    n_val = int(len(y_train) * 0.1)
+    n_fit = len(y_train) - n_val
+    batch_size = config['model']['lstm']['batch_size']
+    train_ds = make_lstm_dataset(
+        X_lstm_train[:n_fit], y_train[:n_fit], sample_weights[:n_fit], batch_size
+    )
+    val_ds = make_lstm_dataset(
+        X_lstm_train[n_fit:], y_train[n_fit:], None, batch_size, shuffle=False
+    )
+    
+    configure_precision(config)
     lstm_model = build_lstm((X_lstm_train.shape[1], X_lstm_train.shape[2]), config)
     
     try:
         lstm_model.fit(
-            X_lstm_train, y_train,
+            train_ds,
             epochs=config['model']['lstm']['epochs'],
-            batch_size=config['model']['lstm']['batch_size'],
-            validation_split=0.1,
-            class_weight=class_weight,
+            validation_data=val_ds,
             verbose=1
         )
         logger.info("LSTM training completed successfully")
@@ -190,8 +500,8 @@ def train():
         logger.error(f"LSTM training failed: {str(e)}")
         raise RuntimeError(f"LSTM training failed: {str(e)}")
     
-    # Save LSTM model
-    lstm_path = os.path.join(config['paths']['artifacts'], 'lstm_model.h5')
+    # Save LSTM model in the native Keras format (faster to load than HDF5)
+    lstm_path = os.path.join(config['paths']['artifacts'], 'lstm_model.keras')
     try:
         lstm_model.save(lstm_path)
         logger.info(f"LSTM model saved to {lstm_path}")
@@ -199,36 +509,479 @@ def train():
         logger.error(f"Failed to save LSTM model: {str(e)}")
         raise
     
-    # 6. Train XGBoost
+    # Optionally export a weight-quantized TFLite model for CPU inference
+    if config['model']['lstm'].get('export_tflite', False):
+        tflite_path = os.path.join(config['paths']['artifacts'], 'lstm_model.tflite')
+        try:
+            export_tflite(lstm_model, tflite_path)
+            logger.info(f"TFLite model exported to {tflite_path}")
+        except Exception as e:
+            logger.warning(f"TFLite export failed: {str(e)}")
+    
+    # Export to ONNX so the inference service can run without the TensorFlow runtime
+    # (plus the vector-input graph used for users without stored history)
+    export_onnx_pair(lstm_model, config)
+    
+    return lstm_model
+
+
+def export_onnx_pair(lstm_model, config):
+    """
+    Export the LSTM's sequence and vector-input ONNX graphs, replacing any previous ones.
+    
+    The service loads lstm_model.onnx ahead of lstm_model.keras, so graphs left
+    over from an earlier run would keep serving the old LSTM. They are deleted
+    first - also when export_onnx is off - and the pair is only kept if both
+    graphs export.
+    
+    Args:
+        lstm_model (tf.keras.Model): Trained LSTM
+        config (dict): Configuration parameters
+    
+    Raises:
+        RuntimeError: If one graph exports and the other does not
+    """
+    paths = {
+        name: os.path.join(config['paths']['artifacts'], f"{name}.onnx")
+        for name in ('lstm_model', 'lstm_vector')
+    }
+    for onnx_path in paths.values():
+        if os.path.exists(onnx_path):
+            os.remove(onnx_path)
+    
+    if not config['model']['lstm'].get('export_onnx', True):
+        return
+    
+    errors = {}
+    for name, vector_input in (('lstm_model', False), ('lstm_vector', True)):
+        try:
+            export_lstm_onnx(
+                lstm_model, paths[name],
+                quantize=config['model']['lstm'].get('onnx_quantize', True),
+                vector_input=vector_input
+            )
+            logger.info(f"ONNX model exported to {paths[name]}")
+        except Exception as e:
+            errors[name] = str(e)
+    
+    if not errors:
+        return
+    # Never leave one new graph next to a missing (or mismatched) partner
+    for onnx_path in paths.values():
+        if os.path.exists(onnx_path):
+            os.remove(onnx_path)
+    if len(errors) < len(paths):
+        raise RuntimeError(f"ONNX export failed for {', '.join(errors)}: {'; '.join(errors.values())}")
+    # Neither graph exported (e.g. tf2onnx missing) - the service serves the Keras model instead
+    logger.warning(f"ONNX export failed: {next(iter(errors.values()))}")
+
+
+def train_xgb(X_xgb_train, y_train, config, max_threads=None):
+    """
+    Train the XGBoost booster and save it to the artifacts directory.
+    
+    Args:
+        X_xgb_train (np.ndarray): Training features (samples, features)
+        y_train (np.ndarray): Training labels
+        config (dict): Configuration parameters
+        max_threads (int, optional): Upper bound on XGBoost threads
+        
+    Returns:
+        xgb.Booster: Trained booster
+        
+    Raises:
+        RuntimeError: If training fails
+    """
     logger.info("Training XGBoost model...")
+    neg, pos = class_counts(y_train)
     scale_pos_weight = neg / pos if pos > 0 else 1.0
     
-    xgb_model = xgb.XGBClassifier(
-        n_estimators=config['model']['xgboost']['n_estimators'],
-        max_depth=config['model']['xgboost']['max_depth'],
-        learning_rate=config['model']['xgboost']['learning_rate'],
-        scale_pos_weight=scale_pos_weight,
-        use_label_encoder=False,
-        eval_metric='logloss',
-        random_state=42
-    )
+    # Histogram-based training: features are quantized into bins once when the
+    # QuantileDMatrix is built and the bins are reused across all boosting rounds.
+    xgb_config = config['model']['xgboost']
+    xgb_params = {
+        'objective': 'binary:logistic',
+        'eval_metric': 'logloss',
+        'tree_method': 'hist',
+        'grow_policy': xgb_config.get('grow_policy', 'lossguide'),
+        'max_bin': xgb_config.get('max_bin', 255),
+        'max_depth': xgb_config['max_depth'],
+        'learning_rate': xgb_config['learning_rate'],
+        'scale_pos_weight': scale_pos_weight,
+        'nthread': xgb_config.get('nthread') or XGB_THREADS,
+        'seed': 42
+    }
+    if xgb_config.get('autotune_threads', False):
+        xgb_params['nthread'] = autotune_xgb_threads(X_xgb_train, y_train, xgb_params)
+    if max_threads:
+        xgb_params['nthread'] = min(xgb_params['nthread'], max_threads)
+    
+    # GPU hist only pays off on large datasets; below the threshold CPU hist is faster
+    device = 'cuda' if len(X_xgb_train) > xgb_config.get('gpu_min_rows', 500000) else 'cpu'
+    logger.info(f"Training XGBoost on {device} ({len(X_xgb_train)} rows)")
+    
+    # Hold out the last part of the (already shuffled) training set for early stopping
+    fit_kwargs = {}
+    early_stopping_rounds = xgb_config.get('early_stopping_rounds')
+    if early_stopping_rounds:
+        n_fit = int(len(y_train) * (1 - xgb_config.get('validation_split', 0.1)))
+        fit_kwargs = {
+            'X_val': X_xgb_train[n_fit:],
+            'y_val': y_train[n_fit:],
+            'early_stopping_rounds': early_stopping_rounds
+        }
+        X_xgb_train, y_train = X_xgb_train[:n_fit], y_train[:n_fit]
     
     try:
-        xgb_model.fit(X_xgb_train, y_train)
+        try:
+            xgb_model = fit_xgb_booster(
+                X_xgb_train, y_train, xgb_params, xgb_config['n_estimators'], device=device, **fit_kwargs
+            )
+        except xgb.core.XGBoostError as e:
+            if device != 'cuda':
+                raise
+            logger.warning(f"GPU training failed, falling back to CPU: {str(e)}")
+            xgb_model = fit_xgb_booster(
+                X_xgb_train, y_train, xgb_params, xgb_config['n_estimators'], device='cpu', **fit_kwargs
+            )
+        # Evaluation and inference run on host arrays
+        xgb_model.set_param({'device': 'cpu'})
         logger.info("XGBoost training completed successfully")
     except Exception as e:
         logger.error(f"XGBoost training failed: {str(e)}")
         raise RuntimeError(f"XGBoost training failed: {str(e)}")
     
-    # Save XGBoost model using joblib (safer than pickle)
-    xgb_path = os.path.join(config['paths']['artifacts'], 'xgb_model.pkl')
+    # Save XGBoost model in its native UBJSON format (binary JSON - no pickle, compact, fast to load)
+    xgb_path = os.path.join(config['paths']['artifacts'], 'xgb_model.ubj')
     try:
-        joblib.dump(xgb_model, xgb_path)
+        xgb_model.save_model(xgb_path)
         logger.info(f"XGBoost model saved to {xgb_path}")
     except Exception as e:
         logger.error(f"Failed to save XGBoost model: {str(e)}")
         raise
     
+    return xgb_model
+
+
+def _share_array(arr):
+    """Copy an array into a new shared memory block and return (block, spec)."""
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _attach_array(spec):
+    """Attach to a shared memory block created by _share_array and return (block, array)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _pin_to_cores(cores):
+    """Restrict the current process to the given CPU cores where supported."""
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+
+def _lstm_worker(x_spec, y_spec, config, cores):
+    """Process entry point: train the LSTM on shared arrays and return the saved model path."""
+    _pin_to_cores(cores)
+    x_shm, X = _attach_array(x_spec)
+    y_shm, y = _attach_array(y_spec)
+    try:
+        train_lstm(X, y, config)
+    finally:
+        del X, y
+        x_shm.close()
+        y_shm.close()
+    return os.path.join(config['paths']['artifacts'], 'lstm_model.keras')
+
+
+def _xgb_worker(x_spec, y_spec, config, cores):
+    """Process entry point: train XGBoost on shared arrays and return the saved model path."""
+    _pin_to_cores(cores)
+    x_shm, X = _attach_array(x_spec)
+    y_shm, y = _attach_array(y_spec)
+    try:
+        train_xgb(X, y, config, max_threads=len(cores) if cores else None)
+    finally:
+        del X, y
+        x_shm.close()
+        y_shm.close()
+    return os.path.join(config['paths']['artifacts'], 'xgb_model.ubj')
+
+
+def train_models_parallel(X_lstm_train, X_xgb_train, y_train, config):
+    """
+    Train the LSTM and XGBoost models concurrently in two worker processes.
+    
+    The training arrays are placed in shared memory once instead of being
+    pickled to each worker, and each worker is pinned to its own half of the
+    available cores so the two frameworks do not compete for the same CPUs.
+    
+    Args:
+        X_lstm_train (np.ndarray): LSTM training sequences
+        X_xgb_train (np.ndarray): XGBoost training features
+        y_train (np.ndarray): Training labels
+        config (dict): Configuration parameters
+        
+    Returns:
+        tuple: (lstm_path, xgb_path) of the saved models
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = []
+    half = len(cpus) // 2
+    lstm_cores, xgb_cores = (cpus[:half], cpus[half:]) if half else (None, None)
+    
+    blocks = []
+    try:
+        x_lstm_shm, x_lstm_spec = _share_array(X_lstm_train)
+        blocks.append(x_lstm_shm)
+        x_xgb_shm, x_xgb_spec = _share_array(X_xgb_train)
+        blocks.append(x_xgb_shm)
+        y_shm, y_spec = _share_array(y_train)
+        blocks.append(y_shm)
+        
+        # 'spawn' gives each worker a fresh TensorFlow/OpenMP runtime
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=2, mp_context=ctx) as ex:
+            f_lstm = ex.submit(_lstm_worker, x_lstm_spec, y_spec, config, lstm_cores)
+            f_xgb = ex.submit(_xgb_worker, x_xgb_spec, y_spec, config, xgb_cores)
+            return f_lstm.result(), f_xgb.result()
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+
+def predict_hybrid(lstm_infer, xgb_model, X_lstm, X_xgb, batch_size=4096):
+    """
+    Compute hybrid (LSTM + XGBoost average) fraud scores in minibatches.
+    
+    Both models score the same slice of rows before moving on, so each
+    batch stays cache-resident and results are written straight into one
+    preallocated float32 array.
+    
+    Args:
+        lstm_infer (Callable): Compiled LSTM forward (see compile_lstm_inference)
+        xgb_model (xgb.Booster): Trained XGBoost booster
+        X_lstm (np.ndarray): LSTM sequences
+        X_xgb (np.ndarray): XGBoost features
+        batch_size (int): Rows scored per batch
+        
+    Returns:
+        np.ndarray: Hybrid scores of shape (samples,)
+    """
+    n = len(X_xgb)
+    hybrid = np.empty(n, dtype=np.float32)
+    for i in range(0, n, batch_size):
+        out = hybrid[i:i + batch_size]
+        out[:] = lstm_infer(X_lstm[i:i + batch_size]).ravel()
+        # inplace_predict scores the numpy batch directly, without building a DMatrix
+        out += xgb_model.inplace_predict(X_xgb[i:i + batch_size])
+        out *= 0.5
+    return hybrid
+
+
+def roc_auc(y_true, scores):
+    """
+    Compute ROC AUC from a single sort of the scores.
+    
+    Uses the rank-sum (Mann-Whitney U) form of AUC, with tied scores given
+    their average rank, which matches sklearn's roc_auc_score.
+    
+    Args:
+        y_true (np.ndarray): Binary labels
+        scores (np.ndarray): Predicted probabilities
+        
+    Returns:
+        float: Area under the ROC curve
+        
+    Raises:
+        ValueError: If only one class is present in y_true
+    """
+    order = np.argsort(scores, kind='mergesort')
+    sorted_scores = scores[order]
+    sorted_labels = y_true[order].astype(np.int64)
+    n = sorted_scores.size
+    
+    # Start index of each run of equal scores
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_scores)) + 1]
+    ends = np.r_[starts[1:], n]
+    # Average 1-based rank of each tie group, weighted by its positive count
+    pos_per_group = np.add.reduceat(sorted_labels, starts)
+    rank_sum = float(np.dot(pos_per_group, (starts + ends + 1) / 2.0))
+    
+    n_pos = int(pos_per_group.sum())
+    n_neg = n - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("Only one class present in y_true. ROC AUC score is not defined in that case.")
+    return (rank_sum - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg)
+
+
+def binary_metrics(y_true, scores, threshold=0.5):
+    """
+    Compute classification metrics from one confusion-matrix pass.
+    
+    Args:
+        y_true (np.ndarray): Binary labels
+        scores (np.ndarray): Predicted probabilities
+        threshold (float): Decision threshold for the positive class
+        
+    Returns:
+        dict: Accuracy, Precision, Recall, F1 Score and ROC AUC
+    """
+    y_pred = np.empty(scores.shape, dtype=np.int8)
+    np.greater(scores, threshold, out=y_pred)
+    # Encode each (label, prediction) pair as 0..3 and count them in one pass
+    codes = y_true.astype(np.int8) * 2
+    codes += y_pred
+    tn, fp, fn, tp = (int(c) for c in np.bincount(codes, minlength=4))
+    
+    # Undefined ratios are reported as 0.0, like sklearn's zero_division default
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "Accuracy": (tp + tn) / y_pred.size,
+        "Precision": precision,
+        "Recall": recall,
+        "F1 Score": f1,
+        "ROC AUC": roc_auc(y_true, scores)
+    }
+
+
+def generate_model_checksums(artifacts_dir):
+    """
+    Generate SHA256 checksums for all saved model files.
+    
+    This function creates a checksums.json file that can be used
+    to verify model integrity during inference.
+    
+    Args:
+        artifacts_dir (str): Directory containing model files
+        
+    Returns:
+        dict: Dictionary of filenames to checksums
+    """
+    checksums_file = os.path.join(artifacts_dir, 'checksums.json')
+    
+    try:
+        checksums = generate_checksums_for_directory(
+            directory=artifacts_dir,
+            output_file=checksums_file,
+            pattern='*'
+        )
+        logger.info(f"Generated checksums for {len(checksums)} files in {artifacts_dir}")
+        return checksums
+    except Exception as e:
+        logger.error(f"Failed to generate checksums: {str(e)}")
+        return {}
+
+
+def train():
+    """
+    Main orchestration function for the model training pipeline.
+    
+    This function performs the complete training workflow:
+    1. Loads and preprocesses data
+    2. Creates sequences for LSTM
+    3. Splits data into train/test sets
+    4. Trains LSTM and XGBoost models (concurrently by default)
+    5. Saves models and generates checksums for security
+    6. Evaluates and saves metrics
+    
+    Raises:
+        FileNotFoundError: If data file does not exist
+        RuntimeError: If training fails
+    """
+    config = load_config()
+    
+    preprocessor = Preprocessor()
+    cache_dir = None
+    if config['data'].get('feature_cache', True) and os.path.exists(config['paths']['raw_data']):
+        cache_dir = os.path.join(
+            config['paths']['processed_data'], 'cache', feature_cache_key(config)
+        )
+    
+    if cache_dir and os.path.exists(os.path.join(cache_dir, 'y.npy')):
+        # 1-3. Reuse features processed from the same raw data and preprocessing config
+        logger.info(f"Loading cached features from {cache_dir}...")
+        X_lstm, X_xgb, y = load_cached_features(cache_dir)
+        # Restore the matching encoders/scaler so inference stays consistent with this run
+        preprocessor.load_artifacts(cache_dir)
+        preprocessor.save_artifacts()
+        logger.info(f"Sequence shapes - LSTM: {X_lstm.shape}, XGB: {X_xgb.shape}")
+    else:
+        # 1. Load Data
+        logger.info("Loading data...")
+        try:
+            df = load_raw_transactions(config['paths']['raw_data'], config)
+            logger.info(f"Loaded {len(df)} records from {config['paths']['raw_data']}")
+        except FileNotFoundError:
+            logger.error(f"Data file not found: {config['paths']['raw_data']}")
+            raise
+        
+        # 2. Preprocess
+        logger.info("Preprocessing data...")
+        df_processed = preprocessor.fit_transform(df)
+        logger.info(f"Preprocessing complete. Shape: {df_processed.shape}")
+        
+        # 3. Create Sequences
+        logger.info("Creating sequences for LSTM...")
+        X_lstm, X_xgb, y = preprocessor.create_sequences(df_processed)
+        # Neither the LSTM nor XGBoost hist needs 64-bit inputs - halve the memory traffic
+        X_lstm = X_lstm.astype(np.float32, copy=False)
+        X_xgb = X_xgb.astype(np.float32, copy=False)
+        y = y.astype(np.int8, copy=False)
+        logger.info(f"Sequence shapes - LSTM: {X_lstm.shape}, XGB: {X_xgb.shape}")
+        
+        if cache_dir:
+            save_cached_features(cache_dir, X_lstm, X_xgb, y)
+            preprocessor.save_artifacts(cache_dir)
+            X_lstm, X_xgb, y = load_cached_features(cache_dir)
+            logger.info(f"Cached processed features in {cache_dir}")
+    
+    # 4. Split Data
+    logger.info("Splitting data into train/test sets...")
+    # Split on indices only, then gather each array once - avoids train_test_split's intermediate copies
+    splitter = StratifiedShuffleSplit(n_splits=1, test_size=config['data']['test_split'], random_state=42)
+    train_idx, test_idx = next(splitter.split(np.zeros(len(y)), y))
+    # Feature splits land in 64-byte aligned buffers for the TF/XGBoost SIMD kernels
+    X_lstm_train, X_lstm_test = take_aligned(X_lstm, train_idx), take_aligned(X_lstm, test_idx)
+    X_xgb_train, X_xgb_test = take_aligned(X_xgb, train_idx), take_aligned(X_xgb, test_idx)
+    y_train, y_test = np.take(y, train_idx), np.take(y, test_idx)
+    del X_lstm, X_xgb, y
+    logger.info(f"Train size: {len(y_train)}, Test size: {len(y_test)}")
+    
+    # Save training splits for debugging (opt-in, written in the background while training runs)
+    if config.get('debug', {}).get('save_splits', False):
+        os.makedirs(config['paths']['processed_data'], exist_ok=True)
+        splits_path = os.path.join(config['paths']['processed_data'], 'X_xgb_train.npz')
+        # Non-daemon so the interpreter waits for the file to be complete before exiting
+        threading.Thread(
+            target=np.savez_compressed,
+            args=(splits_path,),
+            kwargs={'X_xgb_train': X_xgb_train},
+            name='save-splits'
+        ).start()
+        logger.info(f"Saving training split to {splits_path} in the background")
+    
+    # Ensure artifacts directory exists
+    os.makedirs(config['paths']['artifacts'], exist_ok=True)
+    
+    # 5-6. Train LSTM and XGBoost (independent, so they can run concurrently)
+    if config.get('training', {}).get('parallel', True):
+        logger.info("Training LSTM and XGBoost in parallel processes...")
+        lstm_path, xgb_path = train_models_parallel(X_lstm_train, X_xgb_train, y_train, config)
+        lstm_model = tf.keras.models.load_model(lstm_path, compile=False)
+        xgb_model = xgb.Booster(model_file=xgb_path)
+    else:
+        lstm_model = train_lstm(X_lstm_train, y_train, config)
+        xgb_model = train_xgb(X_xgb_train, y_train, config)
+    
     # 7. Generate Checksums for Security
     logger.info("Generating checksums for model files...")
     try:
@@ -248,19 +1001,12 @@ def train():
     # 8. Evaluate Hybrid Model
     logger.info("Evaluating hybrid model...")
     try:
-        lstm_pred = lstm_model.predict(X_lstm_test).flatten()
-        xgb_pred = xgb_model.predict_proba(X_xgb_test)[:, 1]
-        hybrid_pred = 0.5 * lstm_pred + 0.5 * xgb_pred
-        
-        y_pred_class = (hybrid_pred > 0.5).astype(int)
-        
-        metrics = {
-            "Accuracy": float(accuracy_score(y_test, y_pred_class)),
-            "Precision": float(precision_score(y_test, y_pred_class)),
-            "Recall": float(recall_score(y_test, y_pred_class)),
-            "F1 Score": float(f1_score(y_test, y_pred_class)),
-            "ROC AUC": float(roc_auc_score(y_test, hybrid_pred))
-        }
+        lstm_infer = compile_lstm_inference(
+            lstm_model, jit_compile=config['model']['lstm'].get('jit_compile', True)
+        )
+        hybrid_pred = predict_hybrid(lstm_infer, xgb_model, X_lstm_test, X_xgb_test)
+        
+        metrics = binary_metrics(y_test, hybrid_pred)
         
         logger.info(f"Model Metrics: {metrics}")
         
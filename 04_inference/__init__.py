@@ -2,6 +2,9 @@
 
 from .service import FraudDetectionService
 from .schemas import TransactionRequest, PredictionResponse
+from .batching import MicroBatcher
+from .rate_limit import RateLimitMiddleware, TokenBucket
 
-__all__ = ['FraudDetectionService', 'TransactionRequest', 'PredictionResponse']
+__all__ = ['FraudDetectionService', 'TransactionRequest', 'PredictionResponse', 'MicroBatcher',
+           'RateLimitMiddleware', 'TokenBucket']
 __version__ = "1.0.0"
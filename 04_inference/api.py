@@ -18,8 +18,12 @@ Endpoints:
 
 import sys
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
+
 # Add paths for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -27,24 +31,49 @@ project_root = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.append(project_root)
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+try:
+    # orjson serializes responses several times faster than the stdlib json module
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
 import uvicorn
 import uuid
 
 from schemas import TransactionRequest, PredictionResponse
 from service import FraudDetectionService
+from batching import MicroBatcher
+from rate_limit import RateLimitMiddleware
 from utils.config import settings
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Per-client rate limits: route -> (requests, period in seconds)
+RATE_LIMITS = {
+    "/": (100, 60),
+    "/predict": (10, 60),
+}
 
 # Global service instance
 service = None
 
 
+def _physical_cores() -> int:
+    """Return the number of physical CPU cores (logical count if unknown)."""
+    try:
+        import psutil
+        return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    except ImportError:
+        return os.cpu_count() or 1
+
+
+def _worker_count() -> int:
+    """Return the number of uvicorn worker processes sharing this host's cores."""
+    # API_WORKERS wins; WEB_CONCURRENCY is uvicorn's own --workers override
+    return settings.API_WORKERS or int(os.environ.get('WEB_CONCURRENCY') or 1)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -59,10 +88,42 @@ async def lifespan(app: FastAPI):
     # Startup: Load models
     global service
     config_path = os.path.join(project_root, '07_configs', 'config.yaml')
-    service = FraudDetectionService(config_path)
+    # Split the cores between concurrent inference threads and each model call's own
+    # thread pool, so N threads x M intra-op threads never oversubscribes the CPU
+    # (each uvicorn worker process gets its share of the cores and its own model copy)
+    cores = max(1, _physical_cores() // _worker_count())
+    inference_threads = settings.INFERENCE_THREADS or cores
+    # (with PARALLEL_MODEL_CALLS each request runs two model calls at once, so each gets half)
+    intra_op_threads = settings.INTRA_OP_THREADS or max(
+        1, cores // inference_threads // (2 if settings.PARALLEL_MODEL_CALLS else 1)
+    )
+    service = FraudDetectionService(config_path, intra_op_threads=intra_op_threads)
+    # Parsed once at startup; handlers read it from app.state instead of the file
+    app.state.config = service.config
+    # Inference is CPU-bound and synchronous - run it off the event loop
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=inference_threads, thread_name_prefix="predict"
+    )
+    # Same cap for anything Starlette offloads with run_in_threadpool (sync handlers/dependencies)
+    to_thread.current_default_thread_limiter().total_tokens = inference_threads
+    # Trace/compile the models on a pool thread now instead of on the first requests
+    await asyncio.get_running_loop().run_in_executor(app.state.executor, service.warmup)
+    # Group concurrent requests into one model call per batch
+    app.state.batcher = None
+    if settings.MAX_BATCH_SIZE > 1:
+        app.state.batcher = MicroBatcher(
+            service.predict_prepared,
+            max_batch_size=settings.MAX_BATCH_SIZE,
+            max_wait_ms=settings.MAX_WAIT_MS,
+            executor=app.state.executor
+        )
+        await app.state.batcher.start()
     yield
-    # Shutdown: Cleanup if needed
-    pass
+    # Shutdown: the batcher scores the batch in progress and everything already queued,
+    # then the pool finishes any direct (unbatched) predictions before its threads exit
+    if app.state.batcher:
+        await app.state.batcher.stop()
+    app.state.executor.shutdown(wait=True)
 
 
 # Initialize FastAPI with lifespan
@@ -70,24 +131,25 @@ app = FastAPI(
     title="UPI Fraud Detection API",
     description="Real-time hybrid AI scoring engine for UPI transactions",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
-# Configure rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Configure rate limiting (added before CORS so 429 responses still carry CORS headers)
+app.add_middleware(RateLimitMiddleware, limits=RATE_LIMITS)
 
-# Configure CORS using settings
+# Configure CORS using settings - only what the API actually serves, and let
+# browsers cache preflight results instead of sending OPTIONS before every POST
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=600,
 )
 
 
 @app.get("/")
-@limiter.limit("100/minute")
 async def health_check(request: Request):
     """
     Health check endpoint.
@@ -107,9 +169,16 @@ async def health_check(request: Request):
     }
 
 
-@app.post("/predict", response_model=PredictionResponse)
-@limiter.limit("10/minute")
-async def predict_fraud(request: Request, txn: TransactionRequest):
+@app.post(
+    "/predict",
+    response_model=PredictionResponse,
+    # The body is parsed in the handler - document it explicitly
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": TransactionRequest.model_json_schema()}}
+    }}
+)
+async def predict_fraud(request: Request):
     """
     Fraud detection prediction endpoint.
     
@@ -146,10 +215,29 @@ async def predict_fraud(request: Request, txn: TransactionRequest):
             "Hour": 14
         }
     """
+    # Parse and validate the raw JSON in one pass in pydantic-core (no intermediate dict);
+    # invalid input still gets FastAPI's standard 422 response
+    try:
+        txn = TransactionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+    
     try:
         txn_id = str(uuid.uuid4())
-        data = txn.model_dump()
-        result = service.predict(data)
+        # The validated field values; read-only downstream, so no model_dump() copy
+        data = txn.__dict__
+        # Falls back to the loop's default executor if lifespan has not run
+        executor = getattr(request.app.state, 'executor', None)
+        batcher = getattr(request.app.state, 'batcher', None)
+        loop = asyncio.get_running_loop()
+        if batcher:
+            # Preprocess and fetch history concurrently per request; only the model passes are batched
+            prepared = await loop.run_in_executor(executor, service.prepare_inputs, data)
+            result = await batcher.submit(prepared)
+        else:
+            result = await loop.run_in_executor(executor, service.predict, data)
         
         return {
             "transaction_id": txn_id,
@@ -162,9 +250,17 @@ async def predict_fraud(request: Request, txn: TransactionRequest):
 
 
 if __name__ == "__main__":
+    # Worker processes: API_WORKERS, else WEB_CONCURRENCY, else one per CPU
+    workers = settings.API_WORKERS or int(os.environ.get('WEB_CONCURRENCY') or 0) or os.cpu_count() or 1
+    # Spawned workers read this back to split the cores between them (see lifespan)
+    os.environ['WEB_CONCURRENCY'] = str(workers)
+    # Multiple workers require an import string; 04_inference is on sys.path so "api:app" resolves
     uvicorn.run(
-        app,
+        "api:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.LOG_LEVEL.lower()
     )
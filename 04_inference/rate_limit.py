@@ -0,0 +1,127 @@
+"""
+Per-Client Rate Limiting
+
+This module implements an in-process token-bucket rate limiter as a plain
+ASGI middleware. Each (route, client address) pair owns a bucket that refills
+continuously at `requests / period` tokens per second up to `requests`
+tokens; a request spends one token or is rejected with 429.
+
+Checking a request is a dictionary lookup plus a few arithmetic operations on
+time.monotonic_ns(), with no string parsing or storage backend on the hot
+path. All checks run on the event loop thread, so the bucket state needs no
+lock.
+
+Usage:
+    from rate_limit import RateLimitMiddleware
+    
+    app.add_middleware(RateLimitMiddleware, limits={"/predict": (10, 60)})
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+from starlette.responses import JSONResponse
+
+
+class TokenBucket:
+    """
+    Token buckets for many clients sharing one limit.
+    
+    Buckets are kept in least-recently-used order and the oldest is evicted
+    once maxsize clients are tracked; an evicted client simply starts again
+    with a full bucket. Not thread-safe - call from a single thread (the
+    event loop).
+    
+    Attributes:
+        capacity (int): Maximum burst size (and tokens of a new client)
+        period (float): Seconds to refill an empty bucket completely
+        maxsize (int): Maximum number of tracked clients
+    """
+    
+    def __init__(self, capacity: int, period: float, maxsize: int = 10000):
+        """
+        Initialize the buckets.
+        
+        Args:
+            capacity: Requests allowed per period
+            period: Length of the period in seconds
+            maxsize: Maximum number of tracked clients
+        """
+        self.capacity = capacity
+        self.period = period
+        self.maxsize = maxsize
+        self._rate = capacity / (period * 1e9)  # tokens per nanosecond
+        self._buckets: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+    
+    def acquire(self, key: Hashable) -> float:
+        """
+        Spend one token from a client's bucket if available.
+        
+        Args:
+            key: Client identifier
+        
+        Returns:
+            float: 0.0 if the request is allowed, otherwise the seconds until
+                   the next token becomes available
+        """
+        now = time.monotonic_ns()
+        tokens, last = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self._rate)
+        
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self._rate / 1e9
+        
+        # Re-insert at the most-recently-used end and drop the oldest client if full
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return retry_after
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-route token-bucket limits per client address.
+    
+    Routes without a configured limit pass straight through.
+    
+    Attributes:
+        app: The wrapped ASGI application
+        buckets (dict): Route path -> TokenBucket
+    """
+    
+    def __init__(self, app, limits: Dict[str, Tuple[int, float]], maxsize: int = 10000):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: The ASGI application to wrap
+            limits: Route path -> (requests, period in seconds)
+            maxsize: Maximum tracked clients per route
+        """
+        self.app = app
+        self.buckets = {
+            path: TokenBucket(requests, period, maxsize)
+            for path, (requests, period) in limits.items()
+        }
+    
+    async def __call__(self, scope, receive, send):
+        bucket = self.buckets.get(scope.get('path')) if scope['type'] == 'http' else None
+        if bucket is not None:
+            client = scope.get('client')
+            retry_after = bucket.acquire(client[0] if client else '127.0.0.1')
+            if retry_after:
+                response = JSONResponse(
+                    {"error": f"Rate limit exceeded: {bucket.capacity} per {bucket.period:g} seconds"},
+                    status_code=429,
+                    headers={"Retry-After": str(int(retry_after) + 1)}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -2,6 +2,11 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 import re
 
+__all__ = ['TransactionRequest', 'PredictionResponse']
+
+# Compiled once at import; validate_upi runs twice per request
+UPI_ID_PATTERN = re.compile(r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9]+$')
+
 class TransactionRequest(BaseModel):
     SenderUPI: str = Field(..., min_length=3, max_length=100, description="Sender UPI ID")
     ReceiverUPI: str = Field(..., min_length=3, max_length=100, description="Receiver UPI ID")
@@ -16,7 +21,7 @@ class TransactionRequest(BaseModel):
     def validate_upi(cls, v: str) -> str:
         if '@' not in v:
             raise ValueError('UPI ID must contain @ symbol (e.g., user@upi)')
-        if not re.match(r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9]+$', v):
+        if not UPI_ID_PATTERN.match(v):
             raise ValueError('UPI ID format invalid')
         return v
     
@@ -7,24 +7,51 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # Disable GPU completely for TensorFlow to ensure stability and avoid library conflicts in production/CPU environments
 os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
 
-import tensorflow as tf  # Import TensorFlow for running the deep learning LSTM model
+import bisect            # Import bisect to map risk scores to verdicts
+import importlib.util    # Import importlib to detect the optional ONNX Runtime backend
+import tempfile          # Import tempfile to cache converted ONNX models when artifacts are read-only
+import re                # Import re to recognise converted ONNX graphs of earlier model versions
+import threading         # Import threading for per-thread scratch buffers
+import time              # Import time to measure model warmup
+from concurrent.futures import ThreadPoolExecutor  # Import thread pools for feature-store writes and parallel model calls
 import joblib            # Import joblib for loading serialized model files (.pkl)
+import xgboost as xgb    # Import XGBoost for loading natively-saved boosters (.ubj/.json)
 import numpy as np       # Import numpy for matrix and array operations
 import yaml              # Import yaml for reading the configuration file
-import shap              # Import SHAP (SHapley Additive Explanations) for model transparency/explainability
 from utils.preprocessing import Preprocessor  # Import our custom data transformation class
 from utils.logger import setup_logger         # Import our custom logging utility
 from utils.security import (
     SecureModelLoader,
-    calculate_checksum,
+    cached_checksum,
     validate_model_integrity,
     secure_load_pickle,
     ModelSecurityError
 )
 from utils.feature_store import UserFeatureStore, get_feature_store  # Import feature store for real user history
+from utils.inference import (  # Import the fast LSTM forward passes (in-process or on a model server)
+    compile_lstm_inference,
+    compile_xgb_inference,
+    export_lstm_onnx,
+    onnx_lstm_inference,
+    triton_lstm_inference
+)
+from utils.config import load_yaml_config, settings  # Import the cached YAML config loader and env settings
+from utils.cache import TTLCache, RedisScoreCache, array_key  # Import the score caches for repeated inputs
+from batching import ThreadMicroBatcher  # Import the thread-side micro-batcher for concurrent predict() calls
 
 logger = setup_logger()  # Initialize the logger for this service
 
+# Verdicts in order of the risk-score bands separated by (flag, block) thresholds
+VERDICTS = ("ALLOW", "FLAG", "BLOCK")
+
+# Subdirectory of the artifacts directory holding LSTM graphs converted at load time
+ONNX_CACHE_DIR = 'onnx_cache'
+# Converted graph names, e.g. lstm_model.<sha16>.int8.onnx (never the training export lstm_model.onnx)
+CONVERTED_ONNX_PATTERN = re.compile(r'^lstm_(model|vector)\.[0-9a-f]{16}(\.int8)?\.onnx$')
+
+# Config sections the service indexes directly (security and explain have defaults)
+REQUIRED_CONFIG_SECTIONS = ("paths", "data", "features", "model")
+
 
 class ModelLoadingError(Exception):
     """Custom exception for model loading failures."""
@@ -42,25 +69,55 @@ class FraudDetectionService:
     Attributes:
         config (dict): Configuration parameters loaded from YAML
         preprocessor (Preprocessor): Data preprocessing instance
-        lstm_model: Loaded LSTM TensorFlow model
+        lstm_model: Loaded LSTM (Triton client when TRITON_URL is set, ONNX Runtime
+            session, or TensorFlow model as fallback)
+        lstm_infer: Forward function for lstm_model returning numpy probabilities
+        lstm_vector_infer: Forward function taking one feature row per transaction,
+            repeated across the lookback window in-graph (None if unavailable)
         xgb_model: Loaded XGBoost model
-        explainer: SHAP explainer for model interpretability
+        xgb_infer: Fast XGBoost scoring function returning fraud probabilities
+            (compiled node arrays, or the booster's inplace_predict)
+        explainer: SHAP explainer for model interpretability, built on first
+            access (dashboard plots; request scoring uses XGBoost's native pred_contribs)
         secure_loader (SecureModelLoader): Secure model loader with integrity checks
+        model_fingerprint (str): Checksum prefixes of the loaded XGBoost and LSTM files
+        score_cache (TTLCache): Model scores for recently seen inputs (None if disabled)
+        shared_cache (RedisScoreCache): Second cache tier shared by all workers
+            through the feature store's Redis (None if unavailable)
+        store_writer (ThreadPoolExecutor): Single background thread for Redis writes
+            (feature-store history and shared-cache stores; None without Redis)
+        intra_op_threads (int): Threads per model call (None keeps the libraries' defaults)
+        model_pool (ThreadPoolExecutor): Runs the LSTM while the calling thread runs
+            XGBoost (None unless PARALLEL_MODEL_CALLS is set)
+        batcher (ThreadMicroBatcher): Groups concurrent predict() calls into one
+            model call (None until start_batching())
+        known_safe_devices (frozenset): Device IDs exempt from the unknown-device rule
+        verdict_thresholds (tuple): (flag, block) risk-score thresholds
+        high_amount (float): Amount above which unknown devices / odd hours escalate
+        unusual_hour_end (int): Transactions before this hour count as unusual
+        velocity_txn_limit (int): Transactions per hour before the velocity rule fires
+        velocity_amount_limit (float): Amount per hour before the velocity rule fires
+        lookback (int): LSTM sequence length
+        explain_min_score (float): Model risk score from which SHAP factors are computed
+    
+    Batch inputs are assembled in reusable per-thread float32 buffers (see
+    _scratch), so steady-state scoring allocates no new input arrays.
     """
     
-    def __init__(self, config_path="07_configs/config.yaml"):
+    def __init__(self, config_path="07_configs/config.yaml", intra_op_threads=None):
         """
         Initialize the Fraud Detection Service.
         
         Args:
             config_path (str): Path to the configuration YAML file
+            intra_op_threads (int, optional): Threads each ONNX Runtime, TensorFlow
+                or XGBoost call may use; set when several requests run in parallel
             
         Raises:
             ModelLoadingError: If models cannot be loaded
         """
         try:
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_yaml_config(config_path)
         except FileNotFoundError:
             raise ModelLoadingError(
                 f"Configuration file not found: {config_path}\n"
@@ -69,12 +126,50 @@ class FraudDetectionService:
         except yaml.YAMLError as e:
             raise ModelLoadingError(f"Invalid YAML in config file: {str(e)}")
         
+        # Sections read with plain [] indexing below and on the request path
+        missing_sections = [name for name in REQUIRED_CONFIG_SECTIONS if name not in self.config]
+        if missing_sections:
+            raise ModelLoadingError(
+                f"Config file {config_path} is missing required section(s): {', '.join(missing_sections)}\n"
+                f"Compare it with 07_configs/config.yaml."
+            )
+        
+        # Domain-rule settings, resolved once instead of on every request
+        security_config = self.config.get('security', {})
+        self.known_safe_devices = frozenset(security_config.get('known_safe_devices', []))
+        risk_thresholds = security_config.get('risk_thresholds', {'block': 0.8, 'flag': 0.5})
+        self.verdict_thresholds = (risk_thresholds.get('flag', 0.5), risk_thresholds.get('block', 0.8))
+        self.high_amount = security_config.get('amount_thresholds', {}).get('high', 10000)
+        self.unusual_hour_end = security_config.get('unusual_hours', {}).get('end', 5)
+        velocity_thresholds = security_config.get('velocity_thresholds', {})
+        self.velocity_txn_limit = velocity_thresholds.get('transactions_per_hour', 5)
+        self.velocity_amount_limit = velocity_thresholds.get('amount_per_hour', 50000)
+        self.lookback = self.config['data']['lookback']
+        # TreeSHAP dominates scoring cost - skip it for transactions the models clearly clear
+        self.explain_min_score = self.config.get('explain', {}).get('min_score', 0.0)
+        
         self.preprocessor = Preprocessor(config_path)
+        self.intra_op_threads = intra_op_threads
+        self._local = threading.local()  # Per-thread scratch buffers for model inputs
         self.lstm_model = None
+        self.lstm_infer = None
+        self.lstm_vector_infer = None
         self.xgb_model = None
-        self.explainer = None
+        self.xgb_infer = None
+        self._explainer = None
         self.secure_loader = None
+        self.model_fingerprint = None
         self.feature_store = None
+        self.score_cache = None
+        self.shared_cache = None
+        self.batcher = None
+        self.store_writer = None
+        self.model_pool = None
+        if settings.PARALLEL_MODEL_CALLS:
+            # Threads start on demand - one per concurrent caller at most
+            self.model_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="lstm")
+        if settings.PREDICTION_CACHE_SIZE > 0:
+            self.score_cache = TTLCache(settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_TTL)
         
         # Load models with security checks
         self.load_models()
@@ -84,6 +179,14 @@ class FraudDetectionService:
             self.feature_store = get_feature_store()
             if self.feature_store.enabled:
                 logger.info("Feature store initialized for real user history")
+                # One thread keeps each user's writes in request order, off the response path
+                self.store_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feature-store")
+                if self.score_cache is not None and settings.SHARED_PREDICTION_CACHE:
+                    # Same Redis connection pool - other workers' scores become cache hits here
+                    self.shared_cache = RedisScoreCache(
+                        self.feature_store.redis, settings.PREDICTION_CACHE_TTL,
+                        prefix=f"pred:{self.model_fingerprint}:"
+                    )
             else:
                 logger.warning("Feature store disabled - using mocked history")
         except Exception as e:
@@ -120,22 +223,36 @@ class FraudDetectionService:
             self.secure_loader = SecureModelLoader(
                 models_dir=path,
                 checksums_file=checksums_file if os.path.exists(checksums_file) else None,
-                verify_checksums=os.path.exists(checksums_file)
+                verify_checksums=os.path.exists(checksums_file),
+                # Unchanged files are verified from a stat() instead of re-hashing them on every start
+                cache_checksums=True
             )
         except Exception as e:
             logger.warning(f"Failed to initialize secure loader: {str(e)}")
             self.secure_loader = None
         
-        # Define expected model files
-        lstm_path = os.path.join(path, 'lstm_model.h5')
-        xgb_path = os.path.join(path, 'xgb_model.pkl')
+        # Define expected model files (ONNX / native Keras / native XGBoost preferred, legacy files as fallback)
+        lstm_names = ['lstm_model.keras', 'lstm_model.h5']
+        if importlib.util.find_spec('onnxruntime') is not None:
+            lstm_names.insert(0, 'lstm_model.onnx')
+        lstm_path = next(
+            (os.path.join(path, name) for name in lstm_names
+             if os.path.exists(os.path.join(path, name))),
+            os.path.join(path, 'lstm_model.keras')
+        )
+        xgb_name = next(
+            (name for name in ('xgb_model.ubj', 'xgb_model.json')
+             if os.path.exists(os.path.join(path, name))),
+            'xgb_model.pkl'
+        )
+        xgb_path = os.path.join(path, xgb_name)
         
         # Check file existence before loading
         missing_files = []
-        if not os.path.exists(lstm_path):
-            missing_files.append('lstm_model.h5')
+        if not os.path.exists(lstm_path) and not settings.TRITON_URL:
+            missing_files.append('lstm_model.keras')
         if not os.path.exists(xgb_path):
-            missing_files.append('xgb_model.pkl')
+            missing_files.append('xgb_model.ubj')
         
         if missing_files:
             raise ModelLoadingError(
@@ -147,10 +264,39 @@ class FraudDetectionService:
                 f"  ls -la {path}"
             )
         
-        # Load LSTM model (TensorFlow/Keras - no pickle vulnerability)
+        # Shared-cache entries are scoped to these exact model files, so a retrain never serves old scores
+        self.model_fingerprint = cached_checksum(xgb_path)[:8] + (
+            cached_checksum(lstm_path)[:8] if os.path.exists(lstm_path) else 'triton'
+        )
+        
+        # Load LSTM model (ONNX/Keras - no pickle vulnerability)
         try:
-            logger.info(f"Loading LSTM model from {lstm_path}...")
-            self.lstm_model = tf.keras.models.load_model(lstm_path)
+            logger.info(f"Loading LSTM model from {settings.TRITON_URL or lstm_path}...")
+            if settings.TRITON_URL:
+                # Model server - Triton batches LSTM calls from every API worker together
+                self.lstm_model, self.lstm_infer = triton_lstm_inference(settings.TRITON_URL, 'lstm')
+                try:
+                    _, self.lstm_vector_infer = triton_lstm_inference(settings.TRITON_URL, 'lstm_vector')
+                except Exception as e:
+                    logger.warning(f"Triton vector-input LSTM unavailable, padding sequences instead: {str(e)}")
+            elif lstm_path.endswith('.onnx'):
+                # ONNX Runtime (int8-quantized graph) - TensorFlow is never imported
+                self.lstm_model, self.lstm_infer = onnx_lstm_inference(lstm_path, self.intra_op_threads)
+                vector_path = os.path.join(path, 'lstm_vector.onnx')
+                if os.path.exists(vector_path):
+                    _, self.lstm_vector_infer = onnx_lstm_inference(vector_path, self.intra_op_threads)
+            else:
+                # Keras/H5 file - loaded into TensorFlow only if its converted ONNX graphs are not cached yet
+                self.lstm_model = None
+                if not self._load_converted_onnx(lstm_path):
+                    if self.lstm_model is None:
+                        self.lstm_model = self._load_keras_lstm(lstm_path)
+                    # Same compiled graph as training evaluation - avoids Keras predict()'s per-call overhead
+                    jit_compile = self.config['model']['lstm'].get('jit_compile', True)
+                    self.lstm_infer = compile_lstm_inference(self.lstm_model, jit_compile=jit_compile)
+                    self.lstm_vector_infer = compile_lstm_inference(
+                        self.lstm_model, jit_compile=jit_compile, vector_input=True
+                    )
             logger.info("LSTM model loaded successfully")
         except Exception as e:
             raise ModelLoadingError(
@@ -164,11 +310,21 @@ class FraudDetectionService:
             
             # Try using secure loader first
             if self.secure_loader:
-                self.xgb_model = self.secure_loader.load_model('xgb_model.pkl')
+                self.xgb_model = self.secure_loader.load_model(xgb_name)
+            elif xgb_name.endswith(('.ubj', '.json')):
+                # Native XGBoost format needs no unpickling
+                self.xgb_model = xgb.Booster(model_file=xgb_path)
             else:
                 # Fallback to secure_load_pickle
                 self.xgb_model = secure_load_pickle(xgb_path)
             
+            # Legacy pickles hold the sklearn wrapper - keep only the booster for inplace_predict
+            if isinstance(self.xgb_model, xgb.XGBModel):
+                self.xgb_model = self.xgb_model.get_booster()
+            if self.intra_op_threads:
+                # Applies to inplace_predict and pred_contribs alike
+                self.xgb_model.set_param({'nthread': self.intra_op_threads})
+            
             logger.info("XGBoost model loaded successfully")
         except ModelSecurityError as e:
             raise ModelLoadingError(
@@ -180,7 +336,7 @@ class FraudDetectionService:
             # Fallback to joblib with warning
             logger.warning(f"Secure loading failed, using joblib fallback: {str(e)}")
             try:
-                self.xgb_model = joblib.load(xgb_path)
+                self.xgb_model = joblib.load(xgb_path).get_booster()
                 logger.info("XGBoost model loaded via joblib (without integrity verification)")
             except Exception as e2:
                 raise ModelLoadingError(
@@ -188,6 +344,13 @@ class FraudDetectionService:
                     f"The model file may be corrupted. Try retraining: python 03_training/train.py"
                 )
         
+        # Small batches skip XGBoost's fixed per-call cost through flattened node arrays
+        try:
+            self.xgb_infer = compile_xgb_inference(self.xgb_model)
+        except ValueError as e:
+            logger.warning(f"XGBoost model not compiled, using inplace_predict: {str(e)}")
+            self.xgb_infer = self.xgb_model.inplace_predict
+        
         # Load preprocessor artifacts
         try:
             logger.info("Loading preprocessor artifacts...")
@@ -204,16 +367,126 @@ class FraudDetectionService:
                 f"The artifacts may be corrupted. Try retraining: python 03_training/train.py"
             )
         
-        # Initialize SHAP explainer
+        # SHAP explainer for the new booster is built on first use (see explainer)
+        self._explainer = None
+        
+        logger.info("All models loaded successfully with security validation")
+    
+    @property
+    def explainer(self):
+        """
+        SHAP TreeExplainer for the XGBoost model, created on first access.
+        
+        Only the dashboard's plots use it - request scoring gets the same
+        values from XGBoost's pred_contribs - so the API never imports shap
+        (about 75 MB and over a second of startup per worker).
+        
+        Returns:
+            shap.TreeExplainer: The explainer, or None if it cannot be created
+        """
+        if self._explainer is None and self.xgb_model is not None:
+            try:
+                import shap
+                logger.info("Initializing SHAP explainer...")
+                self._explainer = shap.TreeExplainer(self.xgb_model)
+                logger.info("SHAP explainer initialized successfully")
+            except Exception as e:
+                logger.warning(f"Failed to initialize SHAP explainer: {str(e)}")
+        return self._explainer
+    
+    def _load_keras_lstm(self, lstm_path: str):
+        """
+        Load a Keras/H5 LSTM for inference with TensorFlow.
+        
+        Args:
+            lstm_path (str): Keras/H5 model file
+        
+        Returns:
+            keras.Model: The model, without optimizer state or compiled metrics
+        """
+        import tensorflow as tf
+        if self.intra_op_threads:
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(self.intra_op_threads)
+            except RuntimeError:
+                # Only possible before the TensorFlow runtime starts
+                logger.warning("TensorFlow already initialized - intra-op thread count unchanged")
+        # Inference only - skip restoring the optimizer and compiled metrics
+        return tf.keras.models.load_model(lstm_path, compile=False)
+    
+    def _load_converted_onnx(self, lstm_path: str) -> bool:
+        """
+        Serve a Keras/H5 LSTM through ONNX Runtime by converting it once.
+        
+        Models trained before ONNX export existed (or with export_onnx off)
+        ship only as Keras files. When tf2onnx and onnxruntime are installed,
+        the model is exported like training would, and the graphs are cached
+        under the model file's checksum - in artifacts/onnx_cache, or in the
+        temp directory when the artifacts are mounted read-only - so later
+        starts and the other workers load them directly, without importing
+        TensorFlow. Converting a new model version drops the older graphs.
+        
+        Args:
+            lstm_path (str): Keras/H5 model file
+        
+        Returns:
+            bool: True if lstm_infer / lstm_vector_infer now use ONNX Runtime.
+                  When False, lstm_model holds the Keras model if conversion
+                  got as far as loading it (None otherwise).
+        """
+        lstm_config = self.config['model']['lstm']
+        if not lstm_config.get('export_onnx', True) or \
+           importlib.util.find_spec('onnxruntime') is None or importlib.util.find_spec('tf2onnx') is None:
+            return False
+        
+        artifacts = os.path.dirname(lstm_path)
+        # A subdirectory keeps the cache out of checksums.json (only top-level files are hashed) and git
+        cache_dir = os.path.join(artifacts, ONNX_CACHE_DIR) if os.access(artifacts, os.W_OK) \
+            else os.path.join(tempfile.gettempdir(), 'upi_fraud_onnx')
+        quantize = lstm_config.get('onnx_quantize', True)
+        suffix = f"{cached_checksum(lstm_path)[:16]}{'.int8' if quantize else ''}.onnx"
         try:
-            logger.info("Initializing SHAP explainer...")
-            self.explainer = shap.TreeExplainer(self.xgb_model)
-            logger.info("SHAP explainer initialized successfully")
+            os.makedirs(cache_dir, exist_ok=True)
+            paths = {}
+            converted = False
+            for name, vector_input in (('lstm_model', False), ('lstm_vector', True)):
+                paths[name] = os.path.join(cache_dir, f"{name}.{suffix}")
+                if not os.path.exists(paths[name]):
+                    if self.lstm_model is None:
+                        self.lstm_model = self._load_keras_lstm(lstm_path)
+                    logger.info(f"Converting {os.path.basename(lstm_path)} to {paths[name]}...")
+                    export_lstm_onnx(self.lstm_model, paths[name], quantize=quantize, vector_input=vector_input)
+                    converted = True
+            if converted:
+                # Earlier layouts cached next to the model; clear those generations too
+                for directory in {cache_dir, artifacts}:
+                    self._prune_onnx_cache(directory, set(paths.values()))
+            session, infer = onnx_lstm_inference(paths['lstm_model'], self.intra_op_threads)
+            _, vector_infer = onnx_lstm_inference(paths['lstm_vector'], self.intra_op_threads)
         except Exception as e:
-            logger.warning(f"Failed to initialize SHAP explainer: {str(e)}")
-            self.explainer = None
+            logger.warning(f"ONNX conversion failed, serving the LSTM with TensorFlow: {str(e)}")
+            return False
         
-        logger.info("All models loaded successfully with security validation")
+        self.lstm_model, self.lstm_infer, self.lstm_vector_infer = session, infer, vector_infer
+        return True
+    
+    @staticmethod
+    def _prune_onnx_cache(cache_dir: str, keep: set):
+        """
+        Delete converted graphs of earlier model versions from the ONNX cache.
+        
+        Args:
+            cache_dir (str): Directory to clean
+            keep (set): Paths of the current generation
+        """
+        for filename in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, filename)
+            if CONVERTED_ONNX_PATTERN.match(filename) and path not in keep:
+                try:
+                    os.remove(path)
+                    logger.info(f"Removed stale converted graph {path}")
+                except OSError as e:
+                    logger.warning(f"Could not remove stale converted graph {path}: {str(e)}")
     
     def validate_model_integrity(self, file_path: str, expected_checksum: str = None) -> bool:
         """
@@ -236,6 +509,45 @@ class FraudDetectionService:
             logger.error(f"Integrity validation failed: {str(e)}")
             return False
     
+    def warmup(self):
+        """
+        Run synthetic inputs through the whole scoring path once.
+        
+        The first call of each model pays one-off costs (TensorFlow graph
+        tracing and XLA compilation per batch shape, ONNX Runtime and XGBoost
+        buffer allocation, the preprocessor's lookup tables). Running them at
+        startup keeps that cost off the first real requests. Scoring goes
+        through _score directly, so neither the score caches nor the feature
+        store see the synthetic transactions.
+        
+        Returns:
+            float: Seconds spent warming up (None if warmup failed)
+        """
+        start = time.perf_counter()
+        try:
+            sample = {col: 0 for col in self.config['features']['numerical']}
+            sample.update({col: encoder.classes_[0] for col, encoder in self.preprocessor.encoders.items()})
+            feature_vector = self.preprocessor.transform_single(sample)
+            lstm_input = np.zeros((self.lookback, feature_vector.size), dtype=np.float32)
+            
+            # Every padded batch shape _run_lstm can produce, with and without user history
+            bucket = 1
+            while True:
+                self._score([{'feature_vector': feature_vector, 'lstm_input': None}] * bucket)
+                self._score([{'feature_vector': feature_vector, 'lstm_input': lstm_input}] * bucket)
+                if bucket >= settings.MAX_BATCH_SIZE:
+                    break
+                bucket *= 2
+            # The synthetic rows may score below explain_min_score - run TreeSHAP explicitly
+            self.xgb_model.predict(xgb.DMatrix(feature_vector[None]), pred_contribs=True)
+        except Exception as e:
+            logger.warning(f"Model warmup failed: {str(e)}")
+            return None
+        
+        elapsed = time.perf_counter() - start
+        logger.info(f"Models warmed up in {elapsed * 1000:.0f} ms")
+        return elapsed
+    
     def predict(self, transaction_data: dict):
         """
         End-to-end prediction pipeline with fraud risk assessment.
@@ -256,143 +568,382 @@ class FraudDetectionService:
             ValueError: If required features are missing
             RuntimeError: If prediction fails
         """
+        if self.batcher is None:
+            return self.predict_batch([transaction_data])[0]
+        # Preprocess on the calling thread; only the model call is shared with concurrent callers
+        try:
+            prepared = self.prepare_inputs(transaction_data)
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise RuntimeError(f"Failed to process transaction: {str(e)}")
+        return self.batcher.submit(prepared)
+    
+    def start_batching(self, max_batch_size: int = None, max_wait_ms: float = None):
+        """
+        Route predict() through a micro-batcher from now on.
+        
+        For callers that invoke predict() from several threads at once (e.g.
+        dashboard sessions); the API batches asynchronously on its own and
+        does not need this.
+        
+        Args:
+            max_batch_size (int, optional): Maximum calls per batch (default: MAX_BATCH_SIZE)
+            max_wait_ms (float, optional): Maximum batching delay (default: MAX_WAIT_MS)
+        """
+        if self.batcher is not None:
+            return
+        self.batcher = ThreadMicroBatcher(
+            self.predict_prepared,
+            max_batch_size=max_batch_size or settings.MAX_BATCH_SIZE,
+            max_wait_ms=settings.MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        )
+        self.batcher.start()
+    
+    def predict_batch(self, transactions: list):
+        """
+        Score several transactions with one forward pass per model.
+        
+        Each transaction is preprocessed, then the whole group is scored by
+        predict_prepared().
+        
+        Args:
+            transactions (list): Raw transaction dicts
+        
+        Returns:
+            list: One prediction result dict per transaction, in input order
+        
+        Raises:
+            RuntimeError: If models are not loaded or any transaction fails
+        """
+        try:
+            prepared = [self.prepare_inputs(txn) for txn in transactions]
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise RuntimeError(f"Failed to process transaction: {str(e)}")
+        return self.predict_prepared(prepared)
+    
+    def predict_prepared(self, prepared: list):
+        """
+        Run the models on already-preprocessed transactions.
+        
+        Inputs are stacked into a single LSTM batch and a single XGBoost
+        matrix, so per-call framework overhead is paid once for the whole
+        batch. Scores for inputs seen within the cache TTL are reused. Domain
+        rules and verdicts are then applied per transaction exactly as in
+        predict(), and the transactions are handed to store_writer, which
+        records them in the feature store (one pipelined Redis round trip)
+        after the results are returned. Splitting this from
+        prepare_inputs() lets the API preprocess requests concurrently and
+        batch only the model calls.
+        
+        Args:
+            prepared (list): Outputs of prepare_inputs()
+        
+        Returns:
+            list: One prediction result dict per transaction, in input order
+        
+        Raises:
+            RuntimeError: If models are not loaded or scoring fails
+        """
         # Validate models are loaded
         if self.lstm_model is None or self.xgb_model is None:
             raise RuntimeError("Models not loaded. Please check initialization.")
+        if not prepared:
+            return []
         
         try:
-            # 1. Preprocess the incoming raw dictionary into a numerical vector
-            feature_vector = self.preprocessor.transform_single(transaction_data)
-            
-            # Prepare inputs for the XGBoost model (Needs 2D: [1, n_features])
-            xgb_input = feature_vector.reshape(1, -1)
-            
-            # 2. Get user ID and retrieve real transaction history from feature store
-            user_id = transaction_data.get('SenderUPI', 'unknown')
-            lstm_history = None
-            velocity_features = {}
-            
-            if self.feature_store and self.feature_store.enabled:
-                # Get real user history for LSTM
-                lstm_history = self.feature_store.get_history(user_id)
-                
-                # Compute velocity features for enhanced fraud detection
-                txns_last_hour = self.feature_store.get_transaction_count(user_id, hours=1)
-                txns_last_24h = self.feature_store.get_transaction_count(user_id, hours=24)
-                amount_last_hour = self.feature_store.get_amount_in_window(user_id, hours=1)
-                
-                velocity_features = {
-                    'transactions_last_hour': txns_last_hour,
-                    'transactions_last_24h': txns_last_24h,
-                    'amount_last_hour': amount_last_hour
-                }
-                
-                logger.debug(f"User {user_id} velocity features: {velocity_features}")
-            
-            # 3. Prepare LSTM input (Needs 3D: [1, sequence_length, n_features])
-            if lstm_history is not None:
-                # Use real user history
-                lstm_input = lstm_history.reshape(1, self.config['data']['lookback'], -1)
-                logger.debug(f"Using real history for user {user_id}")
-            else:
-                # Not enough history - use current features padded (fallback)
-                lstm_input = np.tile(feature_vector, (1, self.config['data']['lookback'], 1))
-                logger.debug(f"Using padded history for user {user_id}")
-            
-            # 4. Run Inference through both models
-            lstm_score = float(self.lstm_model.predict(lstm_input, verbose=0)[0][0])
-            xgb_score = float(self.xgb_model.predict_proba(xgb_input)[0][1])
-            
-            # 3. Hybrid Logic (Average the AI scores)
-            final_score = 0.5 * lstm_score + 0.5 * xgb_score
+            # Reuse model scores for inputs seen recently; only the misses go through the models
+            keys = [None] * len(prepared)
+            scores = [None] * len(prepared)
+            if self.score_cache is not None:
+                keys = [
+                    array_key(p['feature_vector']) if p['lstm_input'] is None
+                    else array_key(p['feature_vector'], p['lstm_input'])
+                    for p in prepared
+                ]
+                scores = [self.score_cache.get(key) for key in keys]
             
-            # 4. Explainability (Calculate SHAP values for the current transaction)
-            factors = {}
-            if self.explainer:
-                try:
-                    shap_values = self.explainer.shap_values(xgb_input)
-                    feature_names = self.preprocessor.feature_names
-                    factors = dict(zip(feature_names, shap_values[0].tolist()))
-                    
-                    # Sort factors by their absolute impact to find the top 5 most important reasons
-                    factors = dict(sorted(factors.items(), key=lambda item: abs(item[1]), reverse=True)[:5])
-                except Exception as e:
-                    logger.warning(f"SHAP explanation failed: {str(e)}")
+            # Local misses: try the cache shared with the other workers (one MGET per batch)
+            misses = [i for i, score in enumerate(scores) if score is None]
+            if misses and self.shared_cache is not None:
+                for i, score in zip(misses, self.shared_cache.get_many([keys[i] for i in misses])):
+                    if score is not None:
+                        scores[i] = score
+                        self.score_cache.put(keys[i], score)
+                misses = [i for i in misses if scores[i] is None]
             
-            # --- DOMAIN RULE ENHANCEMENT (Hybrid Safety Layer) ---
-            # Load security settings from config
-            security_config = self.config.get('security', {})
-            known_safe_devices = security_config.get('known_safe_devices', [])
-            risk_thresholds = security_config.get('risk_thresholds', {'block': 0.8, 'flag': 0.5})
-            amount_thresholds = security_config.get('amount_thresholds', {'high': 10000, 'critical': 50000})
-            unusual_hours = security_config.get('unusual_hours', {'start': 0, 'end': 5})
-            velocity_thresholds = security_config.get('velocity_thresholds', {
-                'transactions_per_hour': 5,
-                'amount_per_hour': 50000
-            })
+            if misses:
+                for i, score in zip(misses, self._score([prepared[i] for i in misses])):
+                    scores[i] = score
+                    if keys[i] is not None:
+                        self.score_cache.put(keys[i], score)
+                if self.shared_cache is not None:
+                    self.store_writer.submit(self.shared_cache.put_many, [(keys[i], scores[i]) for i in misses])
             
-            input_device = transaction_data.get("DeviceID", "")
-            amount = transaction_data.get("Amount", 0)
-            hour = transaction_data.get("Hour", 12)
+            results = [self._apply_rules(p, *score) for p, score in zip(prepared, scores)]
             
-            # Rule 1: Velocity-Based Checks (using real history from feature store)
-            txns_last_hour = velocity_features.get('transactions_last_hour', 0)
-            amount_last_hour = velocity_features.get('amount_last_hour', 0)
+            # Store the transactions for future history without holding up the response
+            if self.store_writer is not None:
+                self.store_writer.submit(
+                    self.feature_store.add_transactions,
+                    [(p['user_id'], p['feature_vector']) for p in prepared]
+                )
+            return results
             
-            if txns_last_hour > velocity_thresholds.get('transactions_per_hour', 5):
-                logger.warning(f"Domain Rule Triggered: High Velocity ({txns_last_hour} txns/hour)")
-                final_score = max(final_score, 0.85)
-                factors[f"High Transaction Velocity ({txns_last_hour}/hour)"] = 0.45
+        except Exception as e:
+            logger.error(f"Prediction failed: {str(e)}")
+            raise RuntimeError(f"Failed to process transaction: {str(e)}")
+    
+    def _score(self, prepared: list):
+        """
+        Run the LSTM, XGBoost and TreeSHAP attribution on a batch of prepared inputs.
+        
+        Args:
+            prepared (list): Outputs of prepare_inputs()
+        
+        Returns:
+            list: (lstm_score, xgb_score, shap_row) per transaction; shap_row
+                  is None when explanations are unavailable or the blended
+                  model score is below explain_min_score
+        """
+        n = len(prepared)
+        xgb_input = self._scratch('xgb', n, prepared[0]['feature_vector'].shape)
+        for i, p in enumerate(prepared):
+            xgb_input[i] = p['feature_vector']
+        
+        # 4. Run Inference through both models (independent - side by side when model_pool is set;
+        # ONNX Runtime, TensorFlow and the XGBoost fallback release the GIL)
+        # XGBoost: compiled node arrays (inplace_predict for large batches) - no DMatrix either way
+        if self.model_pool is not None:
+            lstm_future = self.model_pool.submit(self._lstm_scores, prepared)
+            xgb_scores = self.xgb_infer(xgb_input)
+            lstm_scores = lstm_future.result()
+        else:
+            lstm_scores = self._lstm_scores(prepared)
+            xgb_scores = self.xgb_infer(xgb_input)
+        
+        # Explainability (SHAP values only for transactions the models consider risky enough)
+        shap_rows = [None] * n
+        explain = np.flatnonzero(0.5 * lstm_scores + 0.5 * xgb_scores >= self.explain_min_score)
+        if explain.size:
+            try:
+                # XGBoost's native C++ TreeSHAP - same values as shap.TreeExplainer without the Python wrapper;
+                # the last column is the bias term
+                contribs = self.xgb_model.predict(xgb.DMatrix(xgb_input[explain]), pred_contribs=True)[:, :-1]
+                for i, row in zip(explain, contribs):
+                    shap_rows[i] = row
+            except Exception as e:
+                logger.warning(f"SHAP explanation failed: {str(e)}")
+        
+        return [(float(lstm_scores[i]), float(xgb_scores[i]), shap_rows[i]) for i in range(n)]
+    
+    def _lstm_scores(self, prepared: list):
+        """
+        Run the LSTM on a batch of prepared inputs (one call per input kind).
+        
+        Args:
+            prepared (list): Outputs of prepare_inputs()
+        
+        Returns:
+            np.ndarray: float32 fraud probability per transaction
+        """
+        n = len(prepared)
+        lstm_scores = np.empty(n, dtype=np.float32)
+        seq_rows = [i for i, p in enumerate(prepared) if p['lstm_input'] is not None]
+        vec_rows = [i for i, p in enumerate(prepared) if p['lstm_input'] is None]
+        if seq_rows:
+            lstm_scores[seq_rows] = self._run_lstm(
+                'lstm', self.lstm_infer, [prepared[i]['lstm_input'] for i in seq_rows]
+            )
+        if vec_rows:
+            vectors = [prepared[i]['feature_vector'] for i in vec_rows]
+            if self.lstm_vector_infer is not None:
+                lstm_scores[vec_rows] = self._run_lstm('lstm_vector', self.lstm_vector_infer, vectors)
+            else:
+                # No vector-input graph exported - repeat the rows into the padded sequence batch
+                lstm_scores[vec_rows] = self._run_lstm(
+                    'lstm', self.lstm_infer, vectors, (self.lookback,) + vectors[0].shape
+                )
+        return lstm_scores
+    
+    def _scratch(self, name: str, rows: int, row_shape: tuple):
+        """
+        Return this thread's reusable float32 buffer for one kind of model input.
+        
+        Buffers start at MAX_BATCH_SIZE rows and only grow, so steady-state
+        requests reuse the same (already-faulted, cache-warm) memory. They are
+        per thread because unbatched predictions run concurrently.
+        
+        Args:
+            name (str): Buffer name (one per model input)
+            rows (int): Rows needed
+            row_shape (tuple): Shape of one row
+        
+        Returns:
+            np.ndarray: View of the first `rows` rows (contents undefined)
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or len(buf) < rows or buf.shape[1:] != row_shape:
+            buf = np.empty((max(rows, settings.MAX_BATCH_SIZE),) + row_shape, dtype=np.float32)
+            buffers[name] = buf
+        return buf[:rows]
+    
+    def _run_lstm(self, name: str, infer, rows: list, row_shape: tuple = None):
+        """
+        Score LSTM inputs in one call, padding the batch to a power of two.
+        
+        Padding means XLA compiles a handful of batch shapes, not one per size.
+        
+        Args:
+            name (str): Scratch buffer name (see _scratch)
+            infer (Callable): lstm_infer or lstm_vector_infer
+            rows (list): Per-transaction input arrays
+            row_shape (tuple, optional): Shape of one batch row; a row of
+                lower rank is broadcast into it (default: rows[0].shape)
+        
+        Returns:
+            np.ndarray: Fraud probability per row
+        """
+        n = len(rows)
+        bucket = 1 << (n - 1).bit_length()
+        batch = self._scratch(name, bucket, row_shape or rows[0].shape)
+        for i, row in enumerate(rows):
+            batch[i] = row
+        batch[n:] = 0
+        return infer(batch)[:n, 0]
+    
+    def prepare_inputs(self, transaction_data: dict):
+        """
+        Build the XGBoost feature vector and LSTM sequence for one transaction.
+        
+        Args:
+            transaction_data (dict): Raw transaction data
+        
+        Returns:
+            dict: transaction, feature_vector, lstm_input (lookback x features,
+                  or None when the user has no stored history - the LSTM then
+                  sees feature_vector repeated across the lookback window),
+                  user_id and velocity_features
+        """
+        # 1. Preprocess the incoming raw dictionary into a numerical vector
+        feature_vector = self.preprocessor.transform_single(transaction_data)
+        
+        # 2. Get user ID and retrieve real transaction history from feature store
+        user_id = transaction_data.get('SenderUPI', 'unknown')
+        lstm_history = None
+        velocity_features = {}
+        
+        if self.feature_store and self.feature_store.enabled:
+            # Real user history for the LSTM plus velocity features, from one Redis read
+            lstm_history, velocity_features = self.feature_store.get_snapshot(user_id)
             
-            if amount_last_hour > velocity_thresholds.get('amount_per_hour', 50000):
-                logger.warning(f"Domain Rule Triggered: High Amount Velocity (₹{amount_last_hour}/hour)")
-                final_score = max(final_score, 0.75)
-                factors[f"High Amount Velocity (₹{amount_last_hour:.0f}/hour)"] = 0.35
+            # Per-request debug logs use lazy %-formatting - nothing is formatted unless DEBUG is on
+            logger.debug("User %s velocity features: %s", user_id, velocity_features)
+        
+        # 3. Prepare LSTM input (2D per transaction: [sequence_length, n_features])
+        if lstm_history is not None:
+            # Use real user history
+            lstm_input = np.ascontiguousarray(
+                lstm_history.reshape(self.lookback, -1), dtype=np.float32
+            )
+            logger.debug("Using real history for user %s", user_id)
+        else:
+            # Not enough history - the current features are repeated inside the LSTM graph (fallback)
+            lstm_input = None
+            logger.debug("Using padded history for user %s", user_id)
+        
+        return {
+            'transaction': transaction_data,
+            'feature_vector': feature_vector,
+            'lstm_input': lstm_input,
+            'user_id': user_id,
+            'velocity_features': velocity_features
+        }
+    
+    def _apply_rules(self, prepared: dict, lstm_score: float, xgb_score: float, shap_row=None):
+        """
+        Combine model scores with domain rules into a verdict.
+        
+        Args:
+            prepared (dict): Output of prepare_inputs for this transaction
+            lstm_score (float): LSTM fraud probability
+            xgb_score (float): XGBoost fraud probability
+            shap_row (np.ndarray, optional): SHAP values for this transaction
+        
+        Returns:
+            dict: Prediction result (see predict)
+        """
+        transaction_data = prepared['transaction']
+        velocity_features = prepared['velocity_features']
+        
+        # Hybrid Logic (Average the AI scores)
+        final_score = 0.5 * lstm_score + 0.5 * xgb_score
+        
+        # Explainability (top SHAP contributions for the current transaction)
+        factors = {}
+        if shap_row is not None:
+            feature_names = self.preprocessor.feature_names
+            impact = np.abs(shap_row)
+            k = min(5, impact.size)
             
-            # Rule 2: Unknown Device Check
-            is_known_device = input_device in known_safe_devices
-            if not is_known_device:
-                logger.warning(f"Domain Rule Triggered: Unknown Device {input_device}")
-                
-                # Context-Aware Decision for Unknown Device:
-                if final_score > 0.4 or amount > amount_thresholds.get('high', 10000):
-                    final_score = max(final_score, 0.95)
-                    factors["Unknown Device + High Risk"] = 0.50
-                else:
-                    final_score = max(final_score, 0.6)
-                    factors["New Device (OTP Required)"] = 0.30
+            # Select the top 5 most important reasons by absolute impact (O(F) partition, then sort only those)
+            top = np.argpartition(-impact, k - 1)[:k]
+            top = top[np.argsort(-impact[top], kind='stable')]
+            factors = {feature_names[i]: float(shap_row[i]) for i in top}
+        
+        # --- DOMAIN RULE ENHANCEMENT (Hybrid Safety Layer) ---
+        # Security settings from config (resolved to plain numbers in __init__)
+        high_amount = self.high_amount
+        
+        input_device = transaction_data.get("DeviceID", "")
+        amount = transaction_data.get("Amount", 0)
+        hour = transaction_data.get("Hour", 12)
+        
+        # Rule 1: Velocity-Based Checks (using real history from feature store)
+        txns_last_hour = velocity_features.get('transactions_last_hour', 0)
+        amount_last_hour = velocity_features.get('amount_last_hour', 0)
+        
+        if txns_last_hour > self.velocity_txn_limit:
+            logger.warning(f"Domain Rule Triggered: High Velocity ({txns_last_hour} txns/hour)")
+            final_score = max(final_score, 0.85)
+            factors[f"High Transaction Velocity ({txns_last_hour}/hour)"] = 0.45
+        
+        if amount_last_hour > self.velocity_amount_limit:
+            logger.warning(f"Domain Rule Triggered: High Amount Velocity (₹{amount_last_hour}/hour)")
+            final_score = max(final_score, 0.75)
+            factors[f"High Amount Velocity (₹{amount_last_hour:.0f}/hour)"] = 0.35
+        
+        # Rule 2: Unknown Device Check
+        is_known_device = input_device in self.known_safe_devices
+        if not is_known_device:
+            logger.warning(f"Domain Rule Triggered: Unknown Device {input_device}")
             
-            # Rule 3: Unusual Hour + High Amount Check
-            elif amount > amount_thresholds.get('high', 10000) and \
-                 (hour < unusual_hours.get('end', 5) or hour > 23):
-                logger.warning(f"Domain Rule Triggered: High Amount at Unusual Hour")
+            # Context-Aware Decision for Unknown Device:
+            if final_score > 0.4 or amount > high_amount:
+                final_score = max(final_score, 0.95)
+                factors["Unknown Device + High Risk"] = 0.50
+            else:
                 final_score = max(final_score, 0.6)
-                factors["Unusual Hour + High Amount"] = 0.40
-            
-            # 5. Determine the Verdict based on the final risk score
-            verdict = "ALLOW"
-            if final_score > risk_thresholds.get('block', 0.8):
-                verdict = "BLOCK"
-            elif final_score > risk_thresholds.get('flag', 0.5):
-                verdict = "FLAG"
-            
-            # 6. Store transaction in feature store for future history
-            if self.feature_store and self.feature_store.enabled:
-                try:
-                    self.feature_store.add_transaction(user_id, feature_vector)
-                    logger.debug(f"Stored transaction for user {user_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to store transaction for user {user_id}: {str(e)}")
-            
-            return {
-                "risk_score": final_score,
-                "verdict": verdict,
-                "lstm_score": lstm_score,
-                "xgb_score": xgb_score,
-                "factors": factors,
-                "velocity_features": velocity_features if velocity_features else None
-            }
-            
-        except Exception as e:
-            logger.error(f"Prediction failed: {str(e)}")
-            raise RuntimeError(f"Failed to process transaction: {str(e)}")
+                factors["New Device (OTP Required)"] = 0.30
+        
+        # Rule 3: Unusual Hour + High Amount Check
+        elif amount > high_amount and (hour < self.unusual_hour_end or hour > 23):
+            logger.warning(f"Domain Rule Triggered: High Amount at Unusual Hour")
+            final_score = max(final_score, 0.6)
+            factors["Unusual Hour + High Amount"] = 0.40
+        
+        # 5. Determine the Verdict based on the final risk score
+        # (bisect_left counts thresholds strictly below the score: > flag -> FLAG, > block -> BLOCK)
+        verdict = VERDICTS[bisect.bisect_left(self.verdict_thresholds, final_score)]
+        
+        return {
+            "risk_score": final_score,
+            "verdict": verdict,
+            "lstm_score": lstm_score,
+            "xgb_score": xgb_score,
+            "factors": factors,
+            "velocity_features": velocity_features if velocity_features else None
+        }
@@ -1,5 +1,7 @@
 import sys # Import system library for path manipulation
 import os # Import OS library for managing environment variables and paths
+import io # Import io for the in-memory CSV export buffer
+import importlib.util # Import importlib to check for the optional pyarrow package
 
 # Add project root and inference folder to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -9,6 +11,7 @@ sys.path.append(os.path.join(project_root, '04_inference'))
 # FIXED: Use absolute paths
 config_path = os.path.join(project_root, '07_configs', 'config.yaml')
 data_path = os.path.join(project_root, '01_data', 'raw', 'upi_transactions.csv')
+parquet_path = os.path.splitext(data_path)[0] + '.parquet' # Optional typed copy (see scripts/csv_to_parquet.py)
 
 # Disable GPU for inference to avoid conflicts and ensure it runs on standard CPU servers
 os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
@@ -26,11 +29,13 @@ import numpy as np # Import numpy for array and matrix operations
 import shap # Import SHAP for generating explainability charts
 import joblib # Import joblib for loading serialized model files
 import matplotlib.pyplot as plt # Import Matplotlib for basic plotting
-import seaborn as sns # Import Seaborn for statistical data visualization
-import yaml # Import yaml for reading configuration files
+from matplotlib.figure import Figure # Import Figure for charts kept outside pyplot's global registry
 from datetime import datetime # Import datetime for timestamping new entries
+from concurrent.futures import ThreadPoolExecutor # Import the executor that computes SHAP off the script thread
+from functools import lru_cache # Import lru_cache for memoizing SHAP values
 from utils.preprocessing import Preprocessor # Import our custom data transformation utility
-from service import FraudDetectionService # Import the core AI service
+from utils.config import load_yaml_config # Import the cached YAML config loader
+from service import FraudDetectionService, logger # Import the core AI service and its logger
 
 # Set Page Configuration for the Streamlit web app
 st.set_page_config(
@@ -41,12 +46,13 @@ st.set_page_config(
 )
 
 # Initialize Session State for tracking new predictions live
+# Stored column-wise (one list per field) so the Dashboard builds its DataFrame without scanning row dicts
 if 'history' not in st.session_state:
-    st.session_state['history'] = []
+    st.session_state['history'] = {col: [] for col in ['Timestamp', 'SenderUPI', 'ReceiverUPI', 'Amount', 'DeviceID',
+                                                      'IsFraud', 'verdict', 'risk_score']}
 
-# Load Configuration from the YAML file
-with open(config_path, 'r') as f: # Use absolute path
-    config = yaml.safe_load(f) # Convert YAML content to a Python dictionary
+# Load Configuration from the YAML file (parsed once per process, not on every rerun)
+config = load_yaml_config(config_path)
 
 # Load AI Assets and cache them to prevent reloading on every user click
 @st.cache_resource # Tell Streamlit to keep these objects in memory
@@ -55,8 +61,113 @@ def load_assets(): # Function to load models and the preprocessor
     # Ensure the path is absolute for the service
     cfg_path = os.path.join(project_root, '07_configs', 'config.yaml')
     service = FraudDetectionService(cfg_path) # Initialize the full AI service (includes models and preprocessor)
+    service.warmup() # Trace/compile the models now so the first prediction is not the slow one
+    if service.explainer is None: # Build the SHAP TreeExplainer once per process, not on the first prediction
+        logger.warning("SHAP explainer unavailable - the XAI plot will be skipped")
+    service.start_batching() # Concurrent sessions share one model call instead of queuing for separate ones
     return service
 
+# One background worker per process for SHAP, so the verdict is drawn while the explanation is computed
+@st.cache_resource # A module-level executor would be recreated (and leak a thread) on every rerun
+def shap_executor():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="shap")
+
+# SHAP values memoized by feature vector, so resubmitting an unchanged form skips TreeSHAP
+@st.cache_resource # Keep the memo across reruns (the leading underscore stops Streamlit hashing the service)
+def shap_memo(_service):
+    @lru_cache(maxsize=256) # Bounded - least recently used vectors are dropped first
+    def shap_values(feature_bytes):
+        xgb_input = np.frombuffer(feature_bytes, dtype=np.float32).reshape(1, -1)
+        return _service.explainer.shap_values(xgb_input) # TreeExplainer cached on the service (see load_assets)
+    return shap_values
+
+def compute_shap(service, data, shap_values): # Runs on the shap worker - no Streamlit calls in here
+    xgb_input = service.preprocessor.transform_single(data).reshape(1, -1) # Re-calculate the feature vector for display
+    return xgb_input, shap_values(xgb_input.tobytes()) # float32 bytes are the memo key
+
+# Reuse one matplotlib figure per chart and session instead of allocating (and never closing) one per rerun
+def session_figure(name, **kwargs):
+    figures = st.session_state.setdefault('figures', {}) # Per session - concurrent sessions never share a figure
+    if name not in figures:
+        # Created once, then only cleared; not registered with pyplot, so it is freed along with the session
+        figures[name] = Figure(**kwargs)
+    fig = figures[name]
+    fig.clf() # Drop the previous rerun's axes
+    return fig
+
+# Columns the Dashboard page uses - transaction IDs, account-holder names and coordinates are never parsed
+DASHBOARD_COLUMNS = ['Timestamp', 'SenderUPI', 'ReceiverUPI', 'Amount', 'DeviceID', 'IsFraud']
+
+# Rows of the CSV read at a time, how many (uniformly sampled) amounts the histogram is built from,
+# and its number of log-spaced bins
+CSV_CHUNK_SIZE = 50_000
+CSV_BLOCK_BYTES = 8 << 20 # pyarrow reads by bytes - roughly CSV_CHUNK_SIZE rows of this file
+AMOUNT_SAMPLE_SIZE = 50_000
+AMOUNT_BINS = 50
+
+# Use the Parquet copy of the CSV when it is up to date and pyarrow is installed - no text parsing
+def transactions_source():
+    if (importlib.util.find_spec('pyarrow') is not None and os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(data_path)):
+        return parquet_path
+    return data_path
+
+# Read the transaction file in bounded chunks, only the Dashboard's columns
+def read_transaction_chunks(path):
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq # Optional dependency - only needed for the Parquet copy
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=CSV_CHUNK_SIZE, columns=DASHBOARD_COLUMNS):
+            yield batch.to_pandas() # Timestamp and IsFraud (int8) are already typed in the file
+    elif importlib.util.find_spec('pyarrow') is not None:
+        import pyarrow as pa # Optional dependency - multithreaded CSV tokenizer
+        import pyarrow.csv as pv
+        reader = pv.open_csv(
+            path,
+            read_options=pv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            convert_options=pv.ConvertOptions(include_columns=DASHBOARD_COLUMNS,
+                                              column_types={'Timestamp': pa.timestamp('us'), 'IsFraud': pa.int8()})
+        )
+        for batch in reader: # One batch per block - bounded memory like the chunked pandas reader
+            yield batch.to_pandas()
+    else:
+        # Timestamps are parsed while reading instead of in a second pass over the column
+        # IsFraud is read as int8; Amount stays float64 - float32 totals already lose the paise on this file
+        yield from pd.read_csv(path, usecols=DASHBOARD_COLUMNS, parse_dates=['Timestamp'], dtype={'IsFraud': 'int8'},
+                               chunksize=CSV_CHUNK_SIZE)
+
+# Summarize the transaction history once and share it across reruns and sessions
+@st.cache_data # Tell Streamlit to reuse the summary until the arguments change
+def summarize_transactions(path, mtime): # mtime is only part of the cache key, so an updated file is re-read
+    # The file is streamed in chunks and folded into totals, the 10 latest rows and a bounded
+    # sample of amounts, so memory stays O(chunk) however large the history grows.
+    # The sample is binned here too, so reruns only draw the cached counts
+    totals = {'count': 0, 'fraud_count': 0, 'amount': 0.0, 'fraud_amount': 0.0}
+    # 10 most recent rows seen so far (typed and empty, so a file without rows still renders)
+    recent = pd.DataFrame(columns=DASHBOARD_COLUMNS).astype({'Timestamp': 'datetime64[ns]', 'Amount': 'float64', 'IsFraud': 'int8'})
+    # Rows with the AMOUNT_SAMPLE_SIZE smallest random keys - a uniform sample
+    sample = pd.DataFrame({'Amount': np.empty(0, np.float32), 'key': np.empty(0, np.float32)})
+    rng = np.random.default_rng(0)
+    for chunk in read_transaction_chunks(path):
+        if chunk.empty: # A header-only CSV still yields one (untyped) chunk from pandas
+            continue
+        fraud = chunk['IsFraud'] == 1
+        totals['count'] += len(chunk)
+        totals['fraud_count'] += int(fraud.sum())
+        totals['amount'] += float(chunk['Amount'].sum())
+        totals['fraud_amount'] += float(chunk.loc[fraud, 'Amount'].sum())
+        recent = pd.concat([recent, chunk.nlargest(10, 'Timestamp')]).nlargest(10, 'Timestamp')
+        keyed = chunk[['Amount']].astype('float32').assign(key=rng.random(len(chunk), dtype=np.float32)) # Plot-only precision
+        sample = pd.concat([sample, keyed]).nsmallest(AMOUNT_SAMPLE_SIZE, 'key')
+    amounts = sample['Amount'].to_numpy()
+    amounts = amounts[amounts > 0] # Log-scale bins need positive amounts
+    if len(amounts) == 0: # No rows (or no positive amounts) - nothing to bin
+        return totals, recent, (np.zeros(0), np.zeros(0))
+    # Widen a single-valued sample so the bin edges still increase
+    edges = np.geomspace(amounts.min(), max(amounts.max(), amounts.min() * 1.01), AMOUNT_BINS + 1)
+    # Scale the sampled counts back up to the whole file
+    counts = np.histogram(amounts, edges)[0] * (totals['count'] / len(sample))
+    return totals, recent, (counts, edges)
+
 try: # Attempt to load the assets and handle errors if files are missing
     service = load_assets()
 except Exception as e: # Catch any loading errors
@@ -73,25 +184,28 @@ menu = st.sidebar.radio("Navigation", ["Dashboard", "Real-Time Prediction", "Mod
 if menu == "Dashboard": # Logic for the main data overview page
     st.title("User Transaction Dashboard") # Page heading
     
-    # Load raw data for display on the dashboard
-    df_raw = pd.read_csv(data_path) # Read the transaction CSV using absolute path
-    df_raw['Timestamp'] = pd.to_datetime(df_raw['Timestamp']) # Convert timestamp strings to datetime objects
+    # Summary of the raw data for display on the dashboard (cached - see summarize_transactions)
+    source = transactions_source() # Absolute path (CSV or its Parquet copy)
+    totals, recent, (amount_counts, amount_edges) = summarize_transactions(source, os.path.getmtime(source))
+    total_trans, fraud_trans = totals['count'], totals['fraud_count'] # Transaction counts
+    total_amt, fraud_amt = totals['amount'], totals['fraud_amount'] # Transaction values
     
     # Combine CSV data with session history (Live updates)
-    if st.session_state['history']:
-        df_history = pd.DataFrame(st.session_state['history'])
-        # Map verdict to IsFraud for charts
-        df_history['IsFraud'] = df_history['verdict'].apply(lambda x: 1 if x == "BLOCK" else 0)
+    if st.session_state['history']['Timestamp']:
+        df_history = pd.DataFrame(st.session_state['history']) # IsFraud was derived from the verdict when each row was stored
+        # Calculate Key Performance Indicators (KPIs) including the live predictions (one pass over plain arrays)
+        live_amt = df_history['Amount'].to_numpy(dtype=np.float64)
+        live_fraud = df_history['IsFraud'].to_numpy(dtype=bool)
+        total_trans += len(live_amt)
+        fraud_trans += int(live_fraud.sum())
+        total_amt += float(live_amt.sum())
+        fraud_amt += float(live_amt[live_fraud].sum())
         # Ensure correct column order and names to match CSV as much as possible
-        df = pd.concat([df_raw, df_history], ignore_index=True)
-    else:
-        df = df_raw
-    
-    # Calculate Key Performance Indicators (KPIs)
-    total_trans = len(df) # Total count of transactions
-    fraud_trans = df['IsFraud'].sum() # Count of fraudulent transactions
-    total_amt = df['Amount'].sum() # Sum of all transaction values
-    fraud_amt = df[df['IsFraud'] == 1]['Amount'].sum() # Sum of fraudulent transaction values
+        recent = pd.concat([recent, df_history[DASHBOARD_COLUMNS]], ignore_index=True)
+        # Only the live rows are binned on a rerun - the CSV's counts come from the cache
+        if len(amount_edges): # No bins without positive amounts in the file
+            live_amounts = np.clip(live_amt, amount_edges[0], amount_edges[-1])
+            amount_counts = amount_counts + np.histogram(live_amounts, amount_edges)[0]
     
     # Display metrics in 4 columns
     col1, col2, col3, col4 = st.columns(4)
@@ -102,8 +216,7 @@ if menu == "Dashboard": # Logic for the main data overview page
     
     # Show the 10 most recent transactions (Including live ones)
     st.subheader("Recent Transactions (Live Feed)")
-    display_cols = ['Timestamp', 'SenderUPI', 'ReceiverUPI', 'Amount', 'DeviceID', 'IsFraud']
-    st.dataframe(df.sort_values(by='Timestamp', ascending=False)[display_cols].head(10)) # Display interactive table
+    st.dataframe(recent.nlargest(10, 'Timestamp')[DASHBOARD_COLUMNS]) # Display interactive table (top 10 without a full sort)
     
     # Data Visualization section
     st.subheader("Transaction Analysis")
@@ -111,16 +224,22 @@ if menu == "Dashboard": # Logic for the main data overview page
     
     with c1: # First chart: Fraud count comparison
         st.write("Fraud vs Normal Transactions") # Chart title
-        fig, ax = plt.subplots() # Create a figure
-        sns.countplot(x='IsFraud', data=df, ax=ax, palette=['#4CAF50', '#F44336']) # Plot bar chart
-        ax.set_xticklabels(['Normal', 'Fraud']) # Label the bars
-        st.pyplot(fig) # Render the plot in Streamlit
+        fraud_counts = pd.DataFrame({
+            'Class': ['Normal', 'Fraud'],
+            'Transactions': [total_trans - fraud_trans, fraud_trans], # The exact counts
+            'Color': ['#4CAF50', '#F44336'],
+        })
+        st.bar_chart(fraud_counts, x='Class', y='Transactions', color='Color') # Drawn by the browser - no matplotlib figure to render
         
     with c2: # Second chart: Distribution of transaction amounts
         st.write("Transaction Amount Distribution (Log Scale)") # Chart title
-        fig, ax = plt.subplots() # Create a figure
-        sns.histplot(df['Amount'], bins=50, log_scale=True, ax=ax) # Plot histogram on log scale
-        st.pyplot(fig) # Render the plot in Streamlit
+        ax = session_figure('amount_histogram').subplots() # Reuse this session's figure
+        if len(amount_edges): # Empty axes when the file has no positive amounts
+            ax.stairs(amount_counts, amount_edges, fill=True, alpha=0.75) # Plot the precomputed histogram
+        ax.set_xscale('log') # Log-spaced bins appear equally wide on a log axis
+        ax.set_xlabel('Amount')
+        ax.set_ylabel('Count')
+        st.pyplot(ax.figure) # Render the plot in Streamlit
 
 elif menu == "Real-Time Prediction": # Logic for the interactive testing page
     st.title("Real-Time Fraud Detection") # Page heading
@@ -162,15 +281,33 @@ elif menu == "Real-Time Prediction": # Logic for the interactive testing page
                 "AmountDiff": 0 # Mock constant for demo
             }
             
-            # Use the core service for prediction (This includes Domain Rules like MAC check)
-            result = service.predict(data)
+            # A resubmit of the exact same form (e.g. a double click) reuses the last verdict
+            pred_key = tuple(sorted(data.items()))
+            repeat = st.session_state.get('last_pred_key') == pred_key
+            if repeat:
+                result = st.session_state['last_pred_result']
+            else:
+                # Use the core service for prediction (This includes Domain Rules like MAC check)
+                result = service.predict(data)
+                st.session_state['last_pred_key'], st.session_state['last_pred_result'] = pred_key, result
+            shap_future = None # No explainer (e.g. shap not installed) - nothing to compute
+            if service.explainer is not None:
+                shap_future = shap_executor().submit(compute_shap, service, data, shap_memo(service)) # Explanation runs while the verdict renders (memoized for repeats)
             
-            # Store result in session history for Dashboard update
-            new_entry = data.copy()
-            new_entry['Timestamp'] = datetime.now()
-            new_entry['verdict'] = result['verdict']
-            new_entry['risk_score'] = result['risk_score']
-            st.session_state['history'].append(new_entry)
+            # Store result in session history for Dashboard update (one value per column; a repeat is not a new transaction)
+            if not repeat:
+                new_entry = {
+                    'Timestamp': datetime.now(),
+                    'SenderUPI': sender_upi,
+                    'ReceiverUPI': receiver_upi,
+                    'Amount': amount,
+                    'DeviceID': device_id,
+                    'IsFraud': 1 if result['verdict'] == "BLOCK" else 0, # Map verdict to IsFraud for charts
+                    'verdict': result['verdict'],
+                    'risk_score': result['risk_score'],
+                }
+                for col, value in new_entry.items():
+                    st.session_state['history'][col].append(value)
             
             # Display Results in the UI
             st.divider() # Horizontal line separator
@@ -190,16 +327,20 @@ elif menu == "Real-Time Prediction": # Logic for the interactive testing page
             # Explainability Section (XAI)
             st.subheader("Explainability (XAI)") # Section title
             
-            # Re-calculate SHAP values for display
-            feature_vector = service.preprocessor.transform_single(data)
-            xgb_input = feature_vector.reshape(1, -1)
-            shap_values = service.explainer.shap_values(xgb_input)
-            
-            fig_shap = plt.figure(figsize=(10, 6)) # Create a matplotlib figure
-            # Generate a bar plot showing which features increased or decreased risk the most
-            shap.summary_plot(shap_values, xgb_input, feature_names=service.preprocessor.feature_names, plot_type="bar", show=False)
-            st.pyplot(fig_shap) # Render the SHAP plot in Streamlit
-
+            if shap_future is None:
+                st.info("SHAP explainer unavailable - no feature explanation for this transaction.") # The verdict above is unaffected
+            else:
+                shap_placeholder = st.empty() # Filled in once the background SHAP computation finishes
+                with shap_placeholder, st.spinner("Computing SHAP explanation..."):
+                    xgb_input, shap_values = shap_future.result()
+                
+                # summary_plot draws on pyplot's current figure, so this one goes through pyplot (on the script thread - pyplot is not thread-safe)
+                fig_shap = plt.figure(figsize=(10, 6))
+                # Generate a bar plot showing which features increased or decreased risk the most
+                shap.summary_plot(shap_values, xgb_input, feature_names=service.preprocessor.feature_names, plot_type="bar", show=False)
+                shap_placeholder.pyplot(fig_shap) # Render the SHAP plot in Streamlit
+                plt.close(fig_shap) # pyplot keeps every figure it creates until closed
+        
         except Exception as e: # Handle any errors during prediction
             st.error(f"Error during prediction: {e}")
 
@@ -249,7 +390,11 @@ elif menu == "Admin Panel": # Admin Panel for system configuration
             'RiskScore': [0.85, 0.72, 0.55, 0.91, 0.48],
             'Verdict': ['BLOCK', 'BLOCK', 'FLAG', 'BLOCK', 'FLAG'],
             'Reason': ['High risk score', 'High amount', 'Unusual hour', 'Critical amount + unusual hour', 'Device unknown']
-        })
+        }).astype({'Verdict': 'category', 'Reason': 'category'})
+        # Lowercased search columns (TransactionID, SenderUPI), built once instead of per keystroke
+        st.session_state['audit_search_keys'] = np.char.lower(
+            st.session_state['audit_logs'][['TransactionID', 'SenderUPI']].to_numpy(dtype=str)
+        )
     
     tab1, tab2, tab3 = st.tabs(["Device Management", "Risk Configuration", "Audit Logs"])
     
@@ -416,17 +561,17 @@ elif menu == "Admin Panel": # Admin Panel for system configuration
                                             options=['BLOCK', 'FLAG'],
                                             default=['BLOCK', 'FLAG'])
         
-        # Apply filters
-        filtered_df = audit_df.copy()
+        # Apply filters (one boolean mask, indexed once)
+        mask = np.ones(len(audit_df), dtype=bool)
         
         if search_term:
-            filtered_df = filtered_df[
-                filtered_df['TransactionID'].str.contains(search_term, case=False, na=False) |
-                filtered_df['SenderUPI'].str.contains(search_term, case=False, na=False)
-            ]
+            # Plain substring match on either column, case-insensitive
+            mask &= (np.char.find(st.session_state['audit_search_keys'], search_term.lower()) >= 0).any(axis=1)
         
         if verdict_filter:
-            filtered_df = filtered_df[filtered_df['Verdict'].isin(verdict_filter)]
+            mask &= audit_df['Verdict'].isin(verdict_filter).to_numpy()
+        
+        filtered_df = audit_df[mask]
         
         # Display filtered results
         st.markdown(f"**Showing {len(filtered_df)} of {len(audit_df)} transactions**")
@@ -441,8 +586,10 @@ elif menu == "Admin Panel": # Admin Panel for system configuration
         # CSV Export
         st.divider()
         
-        # Prepare CSV download
-        csv = filtered_df.to_csv(index=False).encode('utf-8')
+        # Prepare CSV download (encoded chunk by chunk into one buffer - no intermediate str copy)
+        csv = io.BytesIO()
+        filtered_df.to_csv(csv, index=False, encoding='utf-8', chunksize=10_000)
+        csv.seek(0)
         
         col_export, col_spacer = st.columns([1, 3])
         with col_export:
@@ -3,11 +3,25 @@ import json # Import json to handle data formatting
 import time # Import time to simulate network delays and measure latency
 import os # Import os to access environment variables
 from urllib.parse import urljoin
+try:
+    import orjson # Optional: encodes/decodes JSON in C, straight to/from bytes
+except ImportError:
+    orjson = None
 
 # Configuration: Load API URL from environment variable or use default
 API_BASE_URL = os.getenv('API_URL', 'http://localhost:8000')
 API_URL = urljoin(API_BASE_URL.rstrip('/') + '/', 'predict')
 
+# One HTTP session for every payment - keeps the connection to the API open instead of reconnecting per call
+SESSION = requests.Session()
+SESSION.headers['Content-Type'] = 'application/json' # Bodies are sent pre-encoded (see encode_payload)
+
+def encode_payload(payload): # Serialize a request body to JSON bytes
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8')
+
+def decode_response(response): # Parse a JSON response body
+    return orjson.loads(response.content) if orjson else response.json()
+
 def main(): # The main entry point for our simulation app
     print("="*50) # UI separator
     print("      MOCK UPI PAYMENT APP (DEMO)      ") # App title
@@ -72,11 +86,11 @@ def main(): # The main entry point for our simulation app
         try:
             print("[SIGNAL] Contacting Bank Fraud Detection Server...") # Status message
             start_time = time.time() # Start a timer to measure API speed
-            response = requests.post(API_URL, json=payload) # Send the data via a POST request
+            response = SESSION.post(API_URL, data=encode_payload(payload)) # Send the data via a POST request (reusing the pooled connection)
             latency = (time.time() - start_time) * 1000 # Calculate response time in milliseconds
             
             if response.status_code == 200: # If the API call was successful (HTTP 200)
-                result = response.json() # Parse the JSON result from the server
+                result = decode_response(response) # Parse the JSON result from the server
                 
                 print(f"Server Response: {latency:.0f}ms") # Show the API speed
                 print("-" * 50) # UI separator
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+UPI Fraud Detection - Transaction CSV to Parquet Conversion Script
+
+This script writes a Parquet copy of the raw transaction CSV next to it
+(upi_transactions.csv -> upi_transactions.parquet). The dashboard reads the
+copy instead of the CSV while it is at least as new as the CSV, so a cold
+start skips text parsing: timestamps are stored typed, IsFraud as int8 and
+the UPI/device columns dictionary-encoded.
+
+Requires pyarrow (optional dependency, see requirements.txt).
+
+Usage:
+    # After generating or replacing the dataset:
+    python scripts/csv_to_parquet.py
+    
+    # Or specify custom paths:
+    python scripts/csv_to_parquet.py --input data.csv --output data.parquet
+
+Example:
+    $ python utils/generate_data.py
+    $ python scripts/csv_to_parquet.py
+    Wrote 20000 rows to 01_data/raw/upi_transactions.parquet (0.9 MB, CSV 3.3 MB)
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.config import load_yaml_config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Low-cardinality string columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = ['SenderUPI', 'ReceiverUPI', 'DeviceID']
+
+
+def convert(csv_path: str, parquet_path: str, compression: str = 'zstd') -> int:
+    """
+    Convert the transaction CSV to Parquet.
+    
+    Args:
+        csv_path (str): Source CSV file
+        parquet_path (str): Destination Parquet file (written atomically)
+        compression (str): Parquet compression codec (default: 'zstd')
+    
+    Returns:
+        int: Number of rows written
+    
+    Raises:
+        FileNotFoundError: If the CSV file does not exist
+    """
+    df = pd.read_csv(csv_path, parse_dates=['Timestamp'])
+    df = df.astype({col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns})
+    if 'IsFraud' in df.columns:
+        df['IsFraud'] = df['IsFraud'].astype(np.int8)
+    
+    # Write then rename, so a running dashboard never reads a half-written file
+    tmp_path = f"{parquet_path}.tmp"
+    df.to_parquet(tmp_path, engine='pyarrow', compression=compression, index=False)
+    os.replace(tmp_path, parquet_path)
+    return len(df)
+
+
+def main():
+    """Main entry point for the Parquet conversion script."""
+    parser = argparse.ArgumentParser(description='Write a Parquet copy of the raw transaction CSV')
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='07_configs/config.yaml',
+        help='Path to the YAML config (default: 07_configs/config.yaml)'
+    )
+    parser.add_argument(
+        '--input',
+        type=str,
+        default=None,
+        help='CSV file to convert (default: paths.raw_data from the config)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Parquet file to write (default: the input path with a .parquet extension)'
+    )
+    args = parser.parse_args()
+    
+    csv_path = args.input or load_yaml_config(args.config)['paths']['raw_data']
+    parquet_path = args.output or os.path.splitext(csv_path)[0] + '.parquet'
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.error("pyarrow is not installed. Run: pip install pyarrow")
+        sys.exit(1)
+    
+    if not os.path.exists(csv_path):
+        logger.error(f"{csv_path} not found. Generate the dataset first: python utils/generate_data.py")
+        sys.exit(1)
+    
+    rows = convert(csv_path, parquet_path)
+    logger.info(
+        f"Wrote {rows} rows to {parquet_path} "
+        f"({os.path.getsize(parquet_path) / 2**20:.1f} MB, CSV {os.path.getsize(csv_path) / 2**20:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+UPI Fraud Detection - Triton Model Repository Export Script
+
+This script packages the exported LSTM ONNX graphs as a Triton Inference
+Server model repository, so the API can send its LSTM calls to a model
+server (set TRITON_URL) instead of running them in every worker process.
+Each model gets a config.pbtxt with dynamic batching enabled, which lets
+Triton merge concurrent calls from all API workers into larger batches.
+
+XGBoost stays in the API process: explanations come from the booster's
+pred_contribs, and scoring a batch in-process takes microseconds.
+
+Usage:
+    # After training completes (export_onnx: true in the config):
+    python scripts/export_triton.py
+    
+    # Then serve the repository:
+    docker compose --profile triton up
+
+Example:
+    $ python scripts/export_triton.py
+    Exported lstm -> 02_models/triton/lstm
+    Exported lstm_vector -> 02_models/triton/lstm_vector
+"""
+
+import os
+import sys
+import shutil
+import argparse
+from typing import List
+
+# Add project root to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.config import load_yaml_config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Triton model name -> ONNX file in the artifacts directory
+MODELS = {
+    'lstm': 'lstm_model.onnx',
+    'lstm_vector': 'lstm_vector.onnx',
+}
+
+
+def render_model_config(name: str, inputs: List[tuple], outputs: List[tuple], triton_config: dict) -> str:
+    """
+    Render a Triton config.pbtxt for an ONNX Runtime model.
+    
+    Args:
+        name (str): Model name in the repository
+        inputs (List[tuple]): (tensor name, shape without the batch dimension)
+        outputs (List[tuple]): (tensor name, shape without the batch dimension)
+        triton_config (dict): The 'triton' section of the YAML config
+    
+    Returns:
+        str: The config.pbtxt contents
+    """
+    def tensors(specs):
+        return ",\n".join(
+            f'  {{ name: "{tensor}" data_type: TYPE_FP32 dims: [ {", ".join(str(d) for d in dims)} ] }}'
+            for tensor, dims in specs
+        )
+    
+    preferred = ", ".join(str(size) for size in triton_config.get('preferred_batch_size', [8, 32]))
+    return (
+        f'name: "{name}"\n'
+        f'platform: "onnxruntime_onnx"\n'
+        f'max_batch_size: {triton_config.get("max_batch_size", 64)}\n'
+        f'input [\n{tensors(inputs)}\n]\n'
+        f'output [\n{tensors(outputs)}\n]\n'
+        f'dynamic_batching {{\n'
+        f'  preferred_batch_size: [ {preferred} ]\n'
+        f'  max_queue_delay_microseconds: {triton_config.get("max_queue_delay_microseconds", 5000)}\n'
+        f'}}\n'
+        f'instance_group [ {{ kind: KIND_CPU count: {triton_config.get("instances", 1)} }} ]\n'
+    )
+
+
+def export_model(name: str, onnx_path: str, repository: str, triton_config: dict) -> str:
+    """
+    Copy one ONNX model into the repository layout Triton expects.
+    
+    Writes <repository>/<name>/1/model.onnx and <repository>/<name>/config.pbtxt,
+    with tensor names and shapes read from the ONNX graph.
+    
+    Args:
+        name (str): Model name in the repository
+        onnx_path (str): Exported ONNX file
+        repository (str): Model repository directory
+        triton_config (dict): The 'triton' section of the YAML config
+    
+    Returns:
+        str: The model's directory
+    """
+    import onnxruntime as ort
+    
+    session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+    inputs = [(arg.name, arg.shape[1:]) for arg in session.get_inputs()]
+    outputs = [(arg.name, arg.shape[1:]) for arg in session.get_outputs()]
+    
+    model_dir = os.path.join(repository, name)
+    os.makedirs(os.path.join(model_dir, '1'), exist_ok=True)
+    shutil.copyfile(onnx_path, os.path.join(model_dir, '1', 'model.onnx'))
+    with open(os.path.join(model_dir, 'config.pbtxt'), 'w') as f:
+        f.write(render_model_config(name, inputs, outputs, triton_config))
+    return model_dir
+
+
+def main():
+    """Main entry point for the Triton export script."""
+    parser = argparse.ArgumentParser(description='Package the LSTM ONNX models as a Triton model repository')
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='07_configs/config.yaml',
+        help='Path to the YAML config (default: 07_configs/config.yaml)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Model repository directory (default: triton.model_repository from the config)'
+    )
+    args = parser.parse_args()
+    
+    config = load_yaml_config(args.config)
+    triton_config = config.get('triton', {})
+    artifacts_dir = config['paths']['artifacts']
+    repository = args.output or triton_config.get('model_repository', '02_models/triton/')
+    
+    exported = 0
+    for name, filename in MODELS.items():
+        onnx_path = os.path.join(artifacts_dir, filename)
+        if not os.path.exists(onnx_path):
+            logger.warning(f"{onnx_path} not found - skipping {name}")
+            continue
+        model_dir = export_model(name, onnx_path, repository, triton_config)
+        logger.info(f"Exported {name} -> {model_dir}")
+        exported += 1
+    
+    if not exported:
+        logger.error(
+            f"No ONNX models found in {artifacts_dir}. "
+            f"Enable model.lstm.export_onnx and run: python 03_training/train.py"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
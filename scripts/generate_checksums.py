@@ -49,7 +49,7 @@ def generate_checksums(
         artifacts_dir (str): Directory containing model files
         output_file (str): Path to save the checksums JSON file
         include_patterns (List[str]): List of file patterns to include
-                                    (default: ['*.pkl', '*.h5'])
+                                    (default: ['*.pkl', '*.h5', '*.keras', '*.tflite', '*.onnx', '*.ubj', '*.json'])
     
     Returns:
         Dict[str, str]: Dictionary mapping filenames to their SHA256 checksums
@@ -59,7 +59,7 @@ def generate_checksums(
         IOError: If unable to write checksums file
     """
     if include_patterns is None:
-        include_patterns = ['*.pkl', '*.h5', '*.json']
+        include_patterns = ['*.pkl', '*.h5', '*.keras', '*.tflite', '*.onnx', '*.ubj', '*.json']
     
     # Verify artifacts directory exists
     if not os.path.exists(artifacts_dir):
@@ -208,8 +208,8 @@ Examples:
     parser.add_argument(
         '--patterns',
         nargs='+',
-        default=['*.pkl', '*.h5', '*.json'],
-        help='File patterns to include (default: *.pkl *.h5 *.json)'
+        default=['*.pkl', '*.h5', '*.keras', '*.tflite', '*.onnx', '*.ubj', '*.json'],
+        help='File patterns to include (default: *.pkl *.h5 *.keras *.tflite *.onnx *.ubj *.json)'
     )
     
     args = parser.parse_args()
@@ -1 +0,0 @@
-# API Package
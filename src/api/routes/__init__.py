@@ -1 +0,0 @@
-# API Routes Package
@@ -14,12 +14,15 @@ import sys
 import os
 import tempfile
 import hashlib
+import time
+from unittest import mock
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from utils.security import (
     calculate_checksum,
+    cached_checksum,
     validate_model_integrity,
     load_checksums,
     secure_load_pickle,
@@ -157,6 +160,50 @@ class TestChecksumCalculation:
             os.unlink(temp_path)
 
 
+class TestCachedChecksum:
+    """Test cases for the stat-keyed checksum cache."""
+    
+    def test_matches_calculated_checksum(self):
+        """Test that cached and uncached checksums agree, and a sidecar is written."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.bin")
+            with open(path, 'wb') as f:
+                f.write(b"model weights")
+            
+            assert cached_checksum(path) == calculate_checksum(path)
+            assert os.path.exists(path + ".sha256.cache")
+            assert cached_checksum(path) == calculate_checksum(path)
+    
+    def test_unchanged_file_is_not_reread(self):
+        """Test that a matching fingerprint returns the stored digest."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.bin")
+            with open(path, 'wb') as f:
+                f.write(b"model weights")
+            cached_checksum(path)
+            
+            with mock.patch('utils.security.calculate_checksum') as calculate:
+                cached_checksum(path)
+            calculate.assert_not_called()
+    
+    def test_rewritten_file_is_rehashed(self):
+        """Test that changing content invalidates the cache even if mtime is restored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "model.bin")
+            with open(path, 'wb') as f:
+                f.write(b"model weights")
+            original = cached_checksum(path)
+            st = os.stat(path)
+            time.sleep(0.05)  # File timestamps come from a coarse clock
+            
+            with open(path, 'wb') as f:
+                f.write(b"tampered wts!")  # Same size
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            
+            assert cached_checksum(path) != original
+            assert cached_checksum(path) == calculate_checksum(path)
+
+
 class TestModelIntegrityValidation:
     """Test cases for model integrity validation."""
     
@@ -122,31 +122,21 @@ class TestRateLimiting:
     
     def test_rate_limit_headers(self, client):
         """
-        Test that rate limit headers are present.
+        Test the headers sent with rate limiting.
         
-        Rate limiting middleware should include headers like:
-        - X-RateLimit-Limit
-        - X-RateLimit-Remaining
-        - X-RateLimit-Reset
+        RateLimitMiddleware sends no X-RateLimit-* headers; a 429 response
+        carries Retry-After with the seconds until the next token.
         """
         response = client.get("/")
+        assert not any(header.startswith("x-ratelimit-") for header in response.headers)
         
-        # Check for common rate limit headers
-        rate_limit_headers = [
-            "x-ratelimit-limit",
-            "x-ratelimit-remaining",
-            "x-ratelimit-reset",
-            "retry-after"
-        ]
-        
-        has_rate_limit_header = any(
-            header in response.headers for header in rate_limit_headers
-        )
-        
-        # Note: slowapi may not add these headers by default
-        # This test documents expected behavior
-        assert response.status_code == 200 or has_rate_limit_header, \
-            "Should either succeed or have rate limit headers"
+        for _ in range(15):
+            response = client.post("/predict", json={})
+            if response.status_code == 429:
+                break
+        
+        assert response.status_code == 429, "Predict endpoint should be rate limited"
+        assert int(response.headers["retry-after"]) >= 1
     
     def test_different_endpoints_have_different_limits(self, client):
         """
@@ -218,9 +208,8 @@ class TestRateLimiting:
         Different IPs should have separate rate limits.
         Note: In test environment, this may use same IP.
         """
-        # This test documents the expected behavior
-        # Actual implementation depends on key_func in limiter setup
-        # which uses get_remote_address by default
+        # RateLimitMiddleware keys buckets by the ASGI scope's client host,
+        # so every TestClient request shares the "testclient" bucket
         
         response = client.get("/")
         assert response.status_code in [200, 429], "Should handle request appropriately"
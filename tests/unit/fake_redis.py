@@ -0,0 +1,79 @@
+"""In-memory stand-in for the redis-py calls made by the feature store and score cache."""
+
+
+class InMemoryRedis:
+    """
+    Minimal Redis fake with pipelining and a round-trip counter.
+    
+    Commands issued on the pipeline are queued and applied by execute(),
+    which counts as one round trip, like a real redis-py pipeline.
+    
+    Attributes:
+        data (dict): Stored values (strings and lists) by key
+        expiry_ms (dict): Millisecond expiry passed to set() by key
+        round_trips (int): Direct commands plus pipeline executes
+    """
+    
+    def __init__(self):
+        self.data = {}
+        self.expiry_ms = {}
+        self.round_trips = 0
+        self._queued = None
+    
+    def pipeline(self, transaction=True):
+        self._queued = []
+        return self
+    
+    def execute(self):
+        self.round_trips += 1
+        results = [getattr(self, f"_{command}")(*args) for command, args in self._queued]
+        self._queued = None
+        return results
+    
+    def _call(self, command, *args):
+        if self._queued is not None:
+            self._queued.append((command, args))
+            return self
+        self.round_trips += 1
+        return getattr(self, f"_{command}")(*args)
+    
+    def mget(self, names):
+        return self._call("mget", names)
+    
+    def set(self, name, value, px=None):
+        return self._call("set", name, value, px)
+    
+    def lpush(self, name, value):
+        return self._call("lpush", name, value)
+    
+    def ltrim(self, name, start, end):
+        return self._call("ltrim", name, start, end)
+    
+    def expire(self, name, seconds):
+        return self._call("expire", name, seconds)
+    
+    def lrange(self, name, start, end):
+        return self._call("lrange", name, start, end)
+    
+    def _mget(self, names):
+        return [self.data.get(name) for name in names]
+    
+    def _set(self, name, value, px):
+        self.data[name] = value
+        self.expiry_ms[name] = px
+        return True
+    
+    def _lpush(self, name, value):
+        self.data.setdefault(name, []).insert(0, value)
+        return len(self.data[name])
+    
+    def _ltrim(self, name, start, end):
+        self.data[name] = self.data.get(name, [])[start:end + 1]
+        return True
+    
+    def _expire(self, name, seconds):
+        return name in self.data
+    
+    def _lrange(self, name, start, end):
+        items = self.data.get(name, [])
+        return items[start:] if end == -1 else items[start:end + 1]
@@ -0,0 +1,184 @@
+"""Unit tests for the inference micro-batcher."""
+
+import unittest
+import asyncio
+import os
+import sys
+import time
+
+# Add inference module to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../04_inference')))
+
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import MicroBatcher, ThreadMicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for MicroBatcher."""
+    
+    def run_async(self, coro):
+        return asyncio.run(coro)
+    
+    def test_concurrent_requests_share_a_batch(self):
+        """Test that concurrent submissions are scored in one call."""
+        calls = []
+        
+        def predict_batch(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+        
+        async def scenario():
+            batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=50)
+            await batcher.start()
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+            await batcher.stop()
+            return results
+        
+        results = self.run_async(scenario())
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+        self.assertEqual(calls, [[0, 1, 2, 3, 4]])
+    
+    def test_batch_size_is_capped(self):
+        """Test that no batch exceeds max_batch_size."""
+        sizes = []
+        
+        def predict_batch(items):
+            sizes.append(len(items))
+            return items
+        
+        async def scenario():
+            batcher = MicroBatcher(predict_batch, max_batch_size=3, max_wait_ms=20)
+            await batcher.start()
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+            await batcher.stop()
+            return results
+        
+        results = self.run_async(scenario())
+        self.assertEqual(results, list(range(7)))
+        self.assertTrue(all(size <= 3 for size in sizes))
+        self.assertEqual(sum(sizes), 7)
+    
+    def test_failing_item_does_not_fail_batch(self):
+        """Test that one bad item only fails its own request."""
+        def predict_batch(items):
+            if 'bad' in items:
+                raise ValueError("invalid transaction")
+            return [item.upper() for item in items]
+        
+        async def scenario():
+            batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=50)
+            await batcher.start()
+            results = await asyncio.gather(
+                batcher.submit('a'), batcher.submit('bad'), batcher.submit('b'),
+                return_exceptions=True
+            )
+            await batcher.stop()
+            return results
+        
+        results = self.run_async(scenario())
+        self.assertEqual(results[0], 'A')
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 'B')
+    
+    def test_submit_before_start_raises(self):
+        """Test that submitting to a stopped batcher raises."""
+        batcher = MicroBatcher(lambda items: items)
+        with self.assertRaises(RuntimeError):
+            self.run_async(batcher.submit(1))
+    
+    def test_stop_finishes_batch_in_progress(self):
+        """Test that stopping mid-batch still resolves the batch being scored."""
+        def predict_batch(items):
+            time.sleep(0.3)
+            return [item * 2 for item in items]
+        
+        async def scenario():
+            batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=1)
+            await batcher.start()
+            pending = asyncio.ensure_future(batcher.submit(21))
+            await asyncio.sleep(0.05)  # the batch is now running in the executor
+            await asyncio.wait_for(batcher.stop(), 2)
+            return await asyncio.wait_for(pending, 2)
+        
+        self.assertEqual(self.run_async(scenario()), 42)
+    
+    def test_executor_failure_fails_the_batch(self):
+        """Test that callers get an error, not a hang, when the executor is gone."""
+        async def scenario():
+            executor = ThreadPoolExecutor(max_workers=1)
+            executor.shutdown()
+            batcher = MicroBatcher(lambda items: items, max_wait_ms=1, executor=executor)
+            await batcher.start()
+            results = [
+                await asyncio.wait_for(asyncio.gather(batcher.submit(i), return_exceptions=True), 2)
+                for i in range(2)
+            ]
+            await batcher.stop()
+            return results
+        
+        for (result,) in self.run_async(scenario()):
+            self.assertIsInstance(result, RuntimeError)
+    
+    def test_cancelled_worker_fails_its_batch(self):
+        """Test that cancelling the worker mid-batch fails the in-flight requests."""
+        async def scenario():
+            batcher = MicroBatcher(lambda items: time.sleep(0.3) or items, max_wait_ms=1)
+            await batcher.start()
+            pending = asyncio.ensure_future(batcher.submit(1))
+            await asyncio.sleep(0.05)
+            batcher._worker.cancel()
+            result = await asyncio.wait_for(asyncio.gather(pending, return_exceptions=True), 2)
+            await batcher.stop()
+            return result[0]
+        
+        self.assertIsInstance(self.run_async(scenario()), RuntimeError)
+
+
+class TestThreadMicroBatcher(unittest.TestCase):
+    """Test cases for ThreadMicroBatcher."""
+    
+    def test_concurrent_threads_share_a_batch(self):
+        """Test that submissions from several threads are scored together."""
+        calls = []
+        
+        def predict_batch(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+        
+        batcher = ThreadMicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=200)
+        batcher.start()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(batcher.submit, range(5)))
+        batcher.stop()
+        
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+        self.assertLess(len(calls), 5)
+        self.assertEqual(sorted(item for call in calls for item in call), list(range(5)))
+    
+    def test_failing_item_raises_in_its_caller_only(self):
+        """Test that one bad item only fails its own submit()."""
+        def predict_batch(items):
+            if 'bad' in items:
+                raise ValueError("invalid transaction")
+            return [item.upper() for item in items]
+        
+        batcher = ThreadMicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=50)
+        batcher.start()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(batcher.submit, item) for item in ('a', 'bad', 'b')]
+        batcher.stop()
+        
+        self.assertEqual(futures[0].result(), 'A')
+        self.assertIsInstance(futures[1].exception(), ValueError)
+        self.assertEqual(futures[2].result(), 'B')
+    
+    def test_submit_before_start_raises(self):
+        """Test that submitting to a stopped batcher raises."""
+        batcher = ThreadMicroBatcher(lambda items: items)
+        with self.assertRaises(RuntimeError):
+            batcher.submit(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Unit tests for the model score cache."""
+
+import unittest
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.cache import TTLCache, RedisScoreCache, array_key
+from tests.unit.fake_redis import InMemoryRedis
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for TTLCache and array_key."""
+    
+    def test_get_returns_stored_value(self):
+        """Test that a stored value is returned and counted as a hit."""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.put("a", 1)
+        
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache never grows beyond maxsize."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", 3)
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+    
+    def test_entries_expire(self):
+        """Test that entries are dropped after the TTL."""
+        cache = TTLCache(maxsize=4, ttl=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+    
+    def test_array_key_depends_on_contents_dtype_and_shape(self):
+        """Test that keys match only for identical arrays."""
+        x = np.arange(6, dtype=np.float32)
+        
+        self.assertEqual(array_key(x), array_key(x.copy()))
+        self.assertNotEqual(array_key(x), array_key(x.astype(np.float64)))
+        self.assertNotEqual(array_key(x), array_key(x.reshape(2, 3)))
+        self.assertNotEqual(array_key(x), array_key(x + 1))
+
+
+class _BrokenRedis:
+    def mget(self, names):
+        raise ConnectionError("down")
+    
+    def pipeline(self, transaction=True):
+        raise ConnectionError("down")
+
+
+class TestRedisScoreCache(unittest.TestCase):
+    """Test cases for the cross-worker score cache."""
+    
+    def test_round_trip_preserves_scores(self):
+        """Test that stored scores come back with SHAP rows as arrays."""
+        client = InMemoryRedis()
+        cache = RedisScoreCache(client, ttl=1.5)
+        shap_row = np.array([0.25, -0.5], dtype=np.float32)
+        cache.put_many([(b"\x01", (0.1, 0.2, shap_row)), (b"\x02", (0.3, 0.4, None))])
+        
+        first, second, missing = cache.get_many([b"\x01", b"\x02", b"\x03"])
+        
+        self.assertEqual(first[:2], (0.1, 0.2))
+        np.testing.assert_array_equal(first[2], shap_row)
+        self.assertEqual(second, (0.3, 0.4, None))
+        self.assertIsNone(missing)
+        self.assertEqual(set(client.expiry_ms.values()), {1500})
+    
+    def test_malformed_entries_are_misses(self):
+        """Test that undecodable entries are misses without failing the batch."""
+        client = InMemoryRedis()
+        cache = RedisScoreCache(client, prefix="pred:abc:")
+        cache.put_many([(b"\x01", (0.1, 0.2, None))])
+        client.data["pred:abc:02"] = "not json"
+        client.data["pred:abc:03"] = "[0.1, 0.2]"
+        
+        first, *rest = cache.get_many([b"\x01", b"\x02", b"\x03"])
+        
+        self.assertEqual(first, (0.1, 0.2, None))
+        self.assertEqual(rest, [None, None])
+        self.assertIn("pred:abc:01", client.data)
+    
+    def test_redis_errors_are_misses(self):
+        """Test that an unavailable Redis never breaks scoring."""
+        cache = RedisScoreCache(_BrokenRedis())
+        
+        self.assertEqual(cache.get_many([b"\x01"]), [None])
+        cache.put_many([(b"\x01", (0.1, 0.2, None))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Unit tests for the Redis feature store."""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.feature_store import UserFeatureStore
+from tests.unit.fake_redis import InMemoryRedis
+
+
+class TestAddTransactions(unittest.TestCase):
+    """Test cases for pipelined history writes."""
+    
+    def setUp(self):
+        self.store = UserFeatureStore.__new__(UserFeatureStore)
+        self.store.lookback = 2
+        self.store.enabled = True
+        self.store.redis = InMemoryRedis()
+    
+    def test_batch_is_one_round_trip(self):
+        """Test that a batch of writes costs a single pipeline execute."""
+        items = [("a@upi", np.array([1.0, 2.0])), ("b@upi", np.array([3.0, 4.0])), ("a@upi", np.array([5.0, 6.0]))]
+        
+        self.assertTrue(self.store.add_transactions(items))
+        self.assertEqual(self.store.redis.round_trips, 1)
+    
+    def test_history_reads_back_in_order_and_trimmed(self):
+        """Test that written transactions come back oldest first, capped at lookback * 2."""
+        for amount in range(6):
+            self.store.add_transaction("a@upi", np.array([float(amount), 0.0]))
+        
+        history, velocity = self.store.get_snapshot("a@upi")
+        
+        np.testing.assert_array_equal(history[:, 0], [4.0, 5.0])
+        self.assertEqual(velocity['transactions_last_hour'], 4)
+    
+    def test_disabled_store_skips_writes(self):
+        """Test that writes are no-ops without Redis."""
+        self.store.redis = None
+        
+        self.assertFalse(self.store.add_transactions([("a@upi", np.zeros(2))]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Unit tests for the compiled XGBoost inference path."""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+import xgboost as xgb
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.inference import compile_xgb_inference
+
+
+class TestCompileXgbInference(unittest.TestCase):
+    """Test cases for compile_xgb_inference."""
+    
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        X = rng.random((500, 6), dtype=np.float32)
+        y = (X[:, 0] + X[:, 3] > 1).astype(int)
+        params = {'objective': 'binary:logistic', 'max_depth': 4, 'grow_policy': 'lossguide'}
+        cls.booster = xgb.train(params, xgb.DMatrix(X, label=y), num_boost_round=20)
+        cls.X = rng.random((40, 6), dtype=np.float32)
+    
+    def test_matches_inplace_predict(self):
+        """Test that compiled scores equal XGBoost's for small and large batches."""
+        infer = compile_xgb_inference(self.booster, max_rows=16)
+        
+        for rows in (1, 7, 16, 40):
+            np.testing.assert_allclose(
+                infer(self.X[:rows]), self.booster.inplace_predict(self.X[:rows]), atol=1e-6
+            )
+    
+    def test_missing_values_follow_default_direction(self):
+        """Test that NaN features take each split's learned default branch."""
+        infer = compile_xgb_inference(self.booster)
+        X = self.X[:8].copy()
+        X[::2, 0] = np.nan
+        
+        np.testing.assert_allclose(infer(X), self.booster.inplace_predict(X), atol=1e-6)
+    
+    def test_rejects_unsupported_objective(self):
+        """Test that non-logistic models raise ValueError."""
+        X = self.X
+        booster = xgb.train({'objective': 'reg:squarederror'}, xgb.DMatrix(X, label=X[:, 0]), num_boost_round=2)
+        
+        with self.assertRaises(ValueError):
+            compile_xgb_inference(booster)
+
+
+if __name__ == '__main__':
+    unittest.main()
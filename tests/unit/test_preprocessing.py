@@ -103,6 +103,38 @@ class TestPreprocessor(unittest.TestCase):
         # Check that result has expected number of features
         self.assertEqual(len(result), len(preprocessor.feature_names))
     
+    def test_transform_single_matches_fitted_transformers(self):
+        """Test that transform_single reproduces the sklearn encoders and scaler."""
+        preprocessor = Preprocessor(self.config_path)
+        preprocessor.fit_transform(self.sample_data.copy())
+        
+        transaction = {
+            'SenderUPI': 'usera@upi',
+            'ReceiverUPI': 'shopx@upi',
+            'Amount': 750.0,
+            'DeviceID': 'device1',
+            'Latitude': 12.5,
+            'Longitude': 77.0,
+            'Hour': 9,
+            'DayOfWeek': 3,
+            'DayOfMonth': 20,
+            'TimeDiff': 60,
+            'AmountDiff': 10
+        }
+        numerical = preprocessor.config['features']['numerical']
+        categorical = preprocessor.config['features']['categorical']
+        expected = np.concatenate([
+            preprocessor.scalers['scaler'].transform(
+                pd.DataFrame([[transaction[col] for col in numerical]], columns=numerical)
+            )[0],
+            [preprocessor.encoders[col].transform([transaction[col]])[0] for col in categorical]
+        ])
+        
+        result = preprocessor.transform_single(transaction)
+        
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-6)
+    
     def test_transform_single_unseen_label(self):
         """Test transform_single handles unseen labels gracefully."""
         preprocessor = Preprocessor(self.config_path)
@@ -184,6 +216,14 @@ class TestPreprocessor(unittest.TestCase):
         finally:
             # Cleanup
             shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_config_is_not_shared_between_instances(self):
+        """Test that changing one preprocessor's config leaves the others untouched."""
+        first = Preprocessor(self.config_path)
+        first.config['paths']['artifacts'] = '/nonexistent'
+        
+        second = Preprocessor(self.config_path)
+        self.assertNotEqual(second.config['paths']['artifacts'], '/nonexistent')
 
 
 if __name__ == '__main__':
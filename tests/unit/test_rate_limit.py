@@ -0,0 +1,85 @@
+"""Unit tests for the token-bucket rate limiter."""
+
+import unittest
+import os
+import sys
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add inference module to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../04_inference')))
+
+import rate_limit
+from rate_limit import RateLimitMiddleware, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket."""
+    
+    def test_burst_up_to_capacity_then_reject(self):
+        """Test that a client may spend exactly `capacity` tokens at once."""
+        bucket = TokenBucket(capacity=3, period=60)
+        with mock.patch.object(rate_limit.time, 'monotonic_ns', return_value=0):
+            allowed = [bucket.acquire("a") == 0.0 for _ in range(4)]
+        
+        self.assertEqual(allowed, [True, True, True, False])
+    
+    def test_tokens_refill_over_time(self):
+        """Test that one token returns after period / capacity seconds."""
+        bucket = TokenBucket(capacity=2, period=10)
+        now = [0]
+        with mock.patch.object(rate_limit.time, 'monotonic_ns', side_effect=lambda: now[0]):
+            bucket.acquire("a")
+            bucket.acquire("a")
+            self.assertAlmostEqual(bucket.acquire("a"), 5.0)
+            now[0] = 5 * 10**9
+            self.assertEqual(bucket.acquire("a"), 0.0)
+    
+    def test_clients_are_independent_and_bounded(self):
+        """Test per-client buckets and LRU eviction at maxsize."""
+        bucket = TokenBucket(capacity=1, period=60, maxsize=2)
+        self.assertEqual(bucket.acquire("a"), 0.0)
+        self.assertEqual(bucket.acquire("b"), 0.0)
+        self.assertGreater(bucket.acquire("a"), 0.0)
+        bucket.acquire("c")
+        
+        self.assertEqual(len(bucket), 2)
+
+
+class TestRateLimitMiddleware(unittest.TestCase):
+    """Test cases for RateLimitMiddleware."""
+    
+    def setUp(self):
+        app = FastAPI()
+        
+        @app.get("/limited")
+        async def limited():
+            return {"ok": True}
+        
+        @app.get("/open")
+        async def open_route():
+            return {"ok": True}
+        
+        app.add_middleware(RateLimitMiddleware, limits={"/limited": (2, 60)})
+        self.client = TestClient(app)
+    
+    def test_limited_route_returns_429(self):
+        """Test that the third request within the period is rejected."""
+        codes = [self.client.get("/limited").status_code for _ in range(3)]
+        
+        self.assertEqual(codes, [200, 200, 429])
+        response = self.client.get("/limited")
+        self.assertIn("Retry-After", response.headers)
+        self.assertIn("error", response.json())
+    
+    def test_unlisted_route_is_not_limited(self):
+        """Test that routes without a limit pass through."""
+        codes = {self.client.get("/open").status_code for _ in range(5)}
+        
+        self.assertEqual(codes, {200})
+
+
+if __name__ == '__main__':
+    unittest.main()
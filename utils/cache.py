@@ -0,0 +1,204 @@
+"""
+Bounded TTL Cache for Model Scores
+
+Repeated or duplicate transactions (retries, probe traffic) would otherwise
+re-run the full LSTM + XGBoost + SHAP pipeline. This module provides a small
+thread-safe LRU cache with per-entry expiry, keyed by a digest of the exact
+model inputs, so identical inputs reuse their scores while domain rules and
+feature-store updates still run for every request.
+
+RedisScoreCache is an optional second tier shared by all API worker
+processes: a score computed by one worker is reused by the others.
+
+Usage:
+    from utils.cache import TTLCache, array_key
+    
+    cache = TTLCache(maxsize=10000, ttl=60)
+    key = array_key(feature_vector, lstm_input)
+    scores = cache.get(key)
+    if scores is None:
+        scores = run_models(...)
+        cache.put(key, scores)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def array_key(*arrays: np.ndarray) -> bytes:
+    """
+    Build a cache key from the dtype, shape and bytes of numpy arrays.
+    
+    Args:
+        *arrays: Arrays that fully determine the cached value
+    
+    Returns:
+        bytes: 16-byte BLAKE2b digest
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        hasher.update(f"{arr.dtype.str}{arr.shape}".encode())
+        hasher.update(arr.tobytes())
+    return hasher.digest()
+
+
+class TTLCache:
+    """
+    Thread-safe least-recently-used cache whose entries expire after `ttl` seconds.
+    
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Entry lifetime in seconds
+        hits (int): Number of successful lookups
+        misses (int): Number of failed or expired lookups
+    """
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None if absent or expired.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached value or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: Hashable, value: Any):
+        """
+        Store `value` under `key`, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisScoreCache:
+    """
+    Model scores shared across worker processes through Redis.
+    
+    Values are (lstm_score, xgb_score, shap_row) tuples stored as JSON under
+    `<prefix><key hex>` with a millisecond expiry. The prefix should carry a
+    fingerprint of the loaded models (the service uses `pred:<xgb><lstm>:`
+    checksum prefixes), so workers serving different model versions never
+    share entries. Lookups for a whole batch use one MGET and stores use one
+    pipelined round trip. Redis errors and undecodable entries are logged
+    and treated as misses, so scoring never depends on Redis.
+    
+    Attributes:
+        redis: Redis client (decode_responses=True, as used by the feature store)
+        ttl (float): Entry lifetime in seconds
+        prefix (str): Key prefix
+    """
+    
+    def __init__(self, redis, ttl: float = 60.0, prefix: str = "pred:"):
+        """
+        Initialize the shared cache.
+        
+        Args:
+            redis: Connected Redis client
+            ttl: Entry lifetime in seconds
+            prefix: Key prefix
+        """
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def get_many(self, keys: List[bytes]) -> List[Optional[tuple]]:
+        """
+        Look up several scores with one MGET.
+        
+        Args:
+            keys: Digests from array_key()
+        
+        Returns:
+            list: (lstm_score, xgb_score, shap_row) or None per key
+        """
+        try:
+            values = self.redis.mget([self.prefix + key.hex() for key in keys])
+        except Exception as e:
+            logger.warning(f"Shared score cache lookup failed: {str(e)}")
+            return [None] * len(keys)
+        
+        scores = []
+        for value in values:
+            if value is None:
+                scores.append(None)
+                continue
+            try:
+                lstm_score, xgb_score, shap_row = json.loads(value)
+                if shap_row is not None:
+                    shap_row = np.asarray(shap_row, dtype=np.float32)
+            except (TypeError, ValueError) as e:
+                # Written by another version or corrupted - recompute instead of failing the batch
+                logger.warning(f"Ignoring malformed shared score cache entry: {str(e)}")
+                scores.append(None)
+                continue
+            scores.append((lstm_score, xgb_score, shap_row))
+        return scores
+    
+    def put_many(self, items: List[tuple]):
+        """
+        Store several scores in one pipelined round trip.
+        
+        Args:
+            items: (key, (lstm_score, xgb_score, shap_row)) pairs
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, (lstm_score, xgb_score, shap_row) in items:
+                value = json.dumps([
+                    lstm_score,
+                    xgb_score,
+                    shap_row.tolist() if shap_row is not None else None
+                ])
+                pipe.set(self.prefix + key.hex(), value, px=int(self.ttl * 1000))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared score cache update failed: {str(e)}")
@@ -35,12 +35,20 @@ Example:
     echo "API_PORT=9000" > .env
 """
 
+import copy
 import os
 from functools import lru_cache
 from typing import List, Optional
+import yaml
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+try:
+    # libyaml-backed loader is an order of magnitude faster than the pure-Python one
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 
 class Settings(BaseSettings):
     """
@@ -56,11 +64,21 @@ class Settings(BaseSettings):
         API_HOST: Host address for the API server
         API_PORT: Port number for the API server
         API_URL: Full URL for the API endpoint
+        API_WORKERS: Number of uvicorn worker processes
         ENVIRONMENT: Current environment (development, staging, production)
         CORS_ORIGINS: List of allowed CORS origins
         RATE_LIMIT_REQUESTS: Max requests per rate limit period
         RATE_LIMIT_PERIOD: Rate limit period in seconds
         MODEL_PATH: Path to model artifacts
+        INFERENCE_THREADS: Threads running model inference in the API
+        INTRA_OP_THREADS: Threads each model call may use internally
+        PARALLEL_MODEL_CALLS: Run the LSTM and XGBoost of each batch concurrently
+        MAX_BATCH_SIZE: Maximum requests per inference batch
+        MAX_WAIT_MS: Maximum batching delay in milliseconds
+        PREDICTION_CACHE_SIZE: Maximum cached model scores
+        PREDICTION_CACHE_TTL: Lifetime of cached model scores in seconds
+        SHARED_PREDICTION_CACHE: Share cached model scores across workers via Redis
+        TRITON_URL: Triton Inference Server gRPC endpoint serving the LSTM
         LOG_LEVEL: Logging level (DEBUG, INFO, WARNING, ERROR)
         REDIS_URL: Redis connection URL
         API_KEY_SECRET: Secret key for API authentication
@@ -100,6 +118,12 @@ class Settings(BaseSettings):
         description="Full URL for the API endpoint"
     )
     
+    API_WORKERS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Number of uvicorn worker processes (default: CPU count)"
+    )
+    
     # =============================================================================
     # Environment Settings
     # =============================================================================
@@ -140,6 +164,66 @@ class Settings(BaseSettings):
         description="Path to model artifacts directory"
     )
     
+    # =============================================================================
+    # Inference Threading Configuration
+    # =============================================================================
+    INFERENCE_THREADS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Threads running model inference off the event loop (default: physical cores)"
+    )
+    
+    INTRA_OP_THREADS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Threads per ONNX Runtime/TensorFlow/XGBoost call (default: physical cores / INFERENCE_THREADS)"
+    )
+    
+    PARALLEL_MODEL_CALLS: bool = Field(
+        default=False,
+        description="Score the LSTM on a second thread while XGBoost runs (halves the default INTRA_OP_THREADS)"
+    )
+    
+    # =============================================================================
+    # Inference Batching Configuration
+    # =============================================================================
+    MAX_BATCH_SIZE: int = Field(
+        default=64,
+        ge=1,
+        description="Maximum concurrent /predict requests scored in one batch (1 disables batching)"
+    )
+    
+    MAX_WAIT_MS: float = Field(
+        default=5.0,
+        ge=0,
+        description="Maximum time in milliseconds a request waits for its batch to fill"
+    )
+    
+    PREDICTION_CACHE_SIZE: int = Field(
+        default=10000,
+        ge=0,
+        description="Maximum cached model scores for repeated inputs (0 disables the cache)"
+    )
+    
+    PREDICTION_CACHE_TTL: float = Field(
+        default=60.0,
+        gt=0,
+        description="Lifetime of cached model scores in seconds"
+    )
+    
+    SHARED_PREDICTION_CACHE: bool = Field(
+        default=True,
+        description="Share cached model scores across API workers through Redis (when the feature store is connected)"
+    )
+    
+    # =============================================================================
+    # Model Server Configuration
+    # =============================================================================
+    TRITON_URL: Optional[str] = Field(
+        default=None,
+        description="Triton gRPC endpoint (host:port) serving the LSTM; unset runs it in-process"
+    )
+    
     # =============================================================================
     # Logging Configuration
     # =============================================================================
@@ -273,5 +357,36 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache(maxsize=None)
+def _load_yaml_config(abs_path: str) -> dict:
+    with open(abs_path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def load_yaml_config(path: str = "07_configs/config.yaml") -> dict:
+    """
+    Load the project YAML configuration, parsing each file once per process.
+    
+    Training, the inference service and the preprocessor all read the same
+    config file; the parse is cached by absolute path and each caller gets
+    its own deep copy, so one caller's changes never leak into another's.
+    
+    Args:
+        path: Path to the YAML configuration file
+        
+    Returns:
+        dict: Configuration parameters
+        
+    Raises:
+        FileNotFoundError: If the config file does not exist
+        yaml.YAMLError: If the config file is invalid
+        
+    Example:
+        config = load_yaml_config()
+        lookback = config['data']['lookback']
+    """
+    return copy.deepcopy(_load_yaml_config(os.path.abspath(path)))
+
+
 # Global settings instance for easy import
 settings = get_settings()
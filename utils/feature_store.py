@@ -16,8 +16,12 @@ Usage:
     
     store = UserFeatureStore()
     store.add_transaction("user@upi", features)
+    store.add_transactions([("a@upi", features_a), ("b@upi", features_b)])
     history = store.get_history("user@upi")
     count = store.get_transaction_count("user@upi", hours=1)
+    
+    # Everything the inference service needs, in one round trip
+    history, velocity = store.get_snapshot("user@upi")
 
 Dependencies:
     - redis-py: Redis client library
@@ -123,32 +127,51 @@ class UserFeatureStore:
             features = np.array([100.0, 0.5, 0.3, ...])
             store.add_transaction("user@upi", features)
         """
+        return self.add_transactions([(user_id, features)])
+    
+    def add_transactions(self, items) -> bool:
+        """
+        Add several transactions in one pipelined round trip.
+        
+        Same effect as calling add_transaction for each item in order, but
+        the LPUSH/LTRIM/EXPIRE commands for all of them are sent together
+        instead of three round trips per transaction.
+        
+        Args:
+            items: (user_id, features) pairs.
+        
+        Returns:
+            True if successful, False otherwise.
+        """
         if not self.enabled or self.redis is None:
             logger.debug("Feature store disabled, skipping transaction storage")
             return False
         
         try:
-            key = f"user:{user_id}:transactions"
             timestamp = datetime.now().isoformat()
-            data = {
-                'timestamp': timestamp,
-                'features': features.tolist() if isinstance(features, np.ndarray) else features
-            }
-            
-            # Add to list (LPUSH for most recent first)
-            self.redis.lpush(key, json.dumps(data))
-            
-            # Trim to keep only needed transactions (keep extra for safety)
-            self.redis.ltrim(key, 0, self.lookback * 2 - 1)
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id, features in items:
+                key = f"user:{user_id}:transactions"
+                data = {
+                    'timestamp': timestamp,
+                    'features': features.tolist() if isinstance(features, np.ndarray) else features
+                }
+                
+                # Add to list (LPUSH for most recent first)
+                pipe.lpush(key, json.dumps(data))
+                
+                # Trim to keep only needed transactions (keep extra for safety)
+                pipe.ltrim(key, 0, self.lookback * 2 - 1)
+                
+                # Set TTL to 7 days
+                pipe.expire(key, 86400 * 7)
+            pipe.execute()
             
-            # Set TTL to 7 days
-            self.redis.expire(key, 86400 * 7)
-            
-            logger.debug(f"Stored transaction for user {user_id}")
+            logger.debug("Stored %d transaction(s)", len(items))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to store transaction for user {user_id}: {str(e)}")
+            logger.error(f"Failed to store transactions: {str(e)}")
             return False
     
     def get_history(self, user_id: str) -> Optional[np.ndarray]:
@@ -179,7 +202,7 @@ class UserFeatureStore:
             transactions = self.redis.lrange(key, 0, self.lookback - 1)
             
             if len(transactions) < self.lookback:
-                logger.debug(f"Insufficient history for user {user_id}: {len(transactions)}/{self.lookback}")
+                logger.debug("Insufficient history for user %s: %d/%d", user_id, len(transactions), self.lookback)
                 return None
             
             # Parse and extract features (most recent first from Redis)
@@ -191,6 +214,77 @@ class UserFeatureStore:
             logger.error(f"Failed to retrieve history for user {user_id}: {str(e)}")
             return None
     
+    def get_snapshot(self, user_id: str, amount_index: int = 0) -> tuple:
+        """
+        Get the LSTM history and velocity features from a single Redis read.
+        
+        Equivalent to calling get_history, get_transaction_count (1h and 24h)
+        and get_amount_in_window (1h), but fetches the user's list with one
+        LRANGE and parses each entry once instead of four round trips.
+        
+        Args:
+            user_id: Unique identifier for the user.
+            amount_index: Index of the amount feature in the feature vector.
+        
+        Returns:
+            tuple: (history, velocity) where history is a float32 array of shape
+                   (lookback, n_features) or None if insufficient history exists,
+                   and velocity is a dict with transactions_last_hour,
+                   transactions_last_24h and amount_last_hour ({} if disabled).
+        """
+        if not self.enabled or self.redis is None:
+            return None, {}
+        
+        velocity = {
+            'transactions_last_hour': 0,
+            'transactions_last_24h': 0,
+            'amount_last_hour': 0.0
+        }
+        try:
+            key = f"user:{user_id}:transactions"
+            transactions = self.redis.lrange(key, 0, -1)
+        except Exception as e:
+            logger.error(f"Failed to retrieve history for user {user_id}: {str(e)}")
+            return None, velocity
+        
+        now = datetime.now()
+        last_hour = now - timedelta(hours=1)
+        last_day = now - timedelta(hours=24)
+        
+        entries = []
+        for t in transactions:
+            try:
+                data = json.loads(t)
+                tx_time = datetime.fromisoformat(data['timestamp'])
+            except (json.JSONDecodeError, KeyError, ValueError, TypeError):
+                # Skip malformed entries
+                entries.append(None)
+                continue
+            entries.append(data)
+            if tx_time > last_day:
+                velocity['transactions_last_24h'] += 1
+            if tx_time > last_hour:
+                velocity['transactions_last_hour'] += 1
+                features = data.get('features')
+                if isinstance(features, list) and len(features) > amount_index:
+                    try:
+                        velocity['amount_last_hour'] += float(features[amount_index])
+                    except (TypeError, ValueError):
+                        pass
+        
+        history = None
+        recent = entries[:self.lookback]
+        if len(recent) < self.lookback:
+            logger.debug("Insufficient history for user %s: %d/%d", user_id, len(recent), self.lookback)
+        elif all(data is not None for data in recent):
+            try:
+                # Most recent first from Redis - reverse to chronological order for the LSTM
+                history = np.array([data['features'] for data in reversed(recent)], dtype=np.float32)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.error(f"Failed to parse history for user {user_id}: {str(e)}")
+        
+        return history, velocity
+    
     def get_transaction_count(self, user_id: str, hours: int = 1) -> int:
         """
         Count transactions in last N hours (for velocity features).
@@ -0,0 +1,354 @@
+"""
+Compiled Inference Helpers
+
+This module builds fast forward functions for the trained LSTM so that batch
+evaluation (training script) and per-request scoring (inference service)
+avoid Keras's Python-level predict loop. Three backends share one interface -
+a callable mapping a float32 (batch, lookback, features) array to a
+(batch, 1) numpy array of fraud probabilities:
+
+    - compile_lstm_inference: pre-traced, XLA-compiled TensorFlow graph
+    - onnx_lstm_inference: ONNX Runtime session (no TensorFlow needed)
+    - triton_lstm_inference: gRPC call to a Triton Inference Server serving
+      the exported ONNX graph (see scripts/export_triton.py)
+
+compile_xgb_inference does the same for the XGBoost classifier: it flattens
+the trees into NumPy node arrays so one- or few-row batches skip XGBoost's
+fixed per-call cost.
+
+The LSTM backends can also be built for the vector-input variant (see
+lstm_forward), which takes a single (batch, features) row per transaction and
+repeats it across the lookback window inside the graph - the inference
+service's fallback when a user has no stored history.
+
+Usage:
+    from utils.inference import compile_lstm_inference, onnx_lstm_inference
+    
+    infer = compile_lstm_inference(lstm_model)
+    vector_infer = compile_lstm_inference(lstm_model, vector_input=True)
+    # or: export_lstm_onnx(lstm_model, 'lstm_model.onnx')
+    #     session, infer = onnx_lstm_inference('lstm_model.onnx')
+    scores = infer(X_lstm_batch).ravel()
+    xgb_scores = compile_xgb_inference(booster)(X_xgb_batch)
+
+Dependencies:
+    - tensorflow / tf2onnx / onnxruntime / tritonclient: Imported lazily so this module stays cheap to import
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def lstm_forward(lstm_model, vector_input=False):
+    """
+    Build the LSTM's inference-mode forward function and its input signature.
+    
+    With vector_input=True the function takes one (features,) row per
+    transaction and broadcasts it to (lookback, features) inside the graph,
+    so callers never materialize the repeated sequence themselves.
+    
+    Args:
+        lstm_model (tf.keras.Model): Trained LSTM model
+        vector_input (bool): Accept (batch, features) instead of (batch, lookback, features)
+        
+    Returns:
+        tuple: (forward function, tf.TensorSpec with a dynamic batch dimension)
+    """
+    import tensorflow as tf
+    
+    lookback, n_features = lstm_model.input_shape[1:]
+    
+    if vector_input:
+        def forward(v):
+            # Broadcast is a view inside the graph - the repeated rows are never copied on the host
+            seq = tf.broadcast_to(v[:, None, :], [tf.shape(v)[0], lookback, n_features])
+            return lstm_model(seq, training=False)
+        
+        spec = tf.TensorSpec([None, n_features], tf.float32, name='input')
+    else:
+        def forward(x):
+            return lstm_model(x, training=False)
+        
+        spec = tf.TensorSpec([None, lookback, n_features], tf.float32, name='input')
+    
+    return forward, spec
+
+
+def compile_lstm_inference(lstm_model, jit_compile=True, vector_input=False):
+    """
+    Wrap an LSTM model's forward pass in a single pre-traced graph.
+    
+    The forward pass is traced once, at load time, into a concrete function
+    for a float32 (None, lookback, features) input, so no per-call Python
+    tracing or Keras predict() machinery (callbacks, dataset construction)
+    runs on the request path. With jit_compile=True the graph is compiled
+    by XLA, which fuses the LSTM cell matmuls, bias adds and activations
+    with the dense head into fewer kernels.
+    
+    Args:
+        lstm_model (tf.keras.Model): Trained LSTM model
+        jit_compile (bool): Compile the graph with XLA
+        vector_input (bool): Take (batch, features) rows (see lstm_forward)
+        
+    Returns:
+        Callable: Function mapping a (batch, lookback, features) array - or a
+                  (batch, features) array with vector_input - to a (batch, 1)
+                  numpy array of fraud probabilities
+    """
+    import tensorflow as tf
+    
+    forward, spec = lstm_forward(lstm_model, vector_input=vector_input)
+    # Dynamic batch dimension - one trace serves every batch size
+    concrete = tf.function(forward, jit_compile=jit_compile).get_concrete_function(spec)
+    
+    def infer(x):
+        return concrete(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+    
+    logger.info(f"LSTM inference function traced for {spec.shape} (XLA: {jit_compile})")
+    return infer
+
+
+def export_lstm_onnx(lstm_model, path, quantize=True, vector_input=False):
+    """
+    Export the LSTM's forward pass to ONNX, optionally with int8 dynamic quantization.
+    
+    The graph takes a float32 (None, lookback, features) input named
+    'input' - or (None, features) with vector_input, repeated across the
+    lookback window inside the graph - so ONNX Runtime can serve any batch
+    size. Dynamic quantization stores weights as int8 and quantizes
+    activations on the fly, which lets ONNX Runtime use VNNI int8 GEMMs on
+    recent CPUs.
+    
+    The file is written under a temporary name and moved into place, so
+    processes exporting the same model concurrently never see a partial file.
+    
+    Args:
+        lstm_model (tf.keras.Model): Trained LSTM model
+        path (str): Destination .onnx file
+        quantize (bool): Quantize weights to int8
+        vector_input (bool): Export the vector-input variant (see lstm_forward)
+        
+    Raises:
+        ImportError: If tf2onnx (or onnxruntime, when quantizing) is not installed
+    """
+    import os
+    import tensorflow as tf
+    import tf2onnx
+    
+    forward, spec = lstm_forward(lstm_model, vector_input=vector_input)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    float_path = tmp_path + '.fp32' if quantize else tmp_path
+    try:
+        # Convert the traced inference function (from_keras does not support Keras 3 models)
+        tf2onnx.convert.from_function(
+            tf.function(forward), input_signature=(spec,), opset=17, output_path=float_path
+        )
+        if quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(float_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, path)
+    finally:
+        for leftover in (float_path, tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def onnx_lstm_inference(model_path, intra_op_threads=None):
+    """
+    Load an exported LSTM ONNX model into an optimized ONNX Runtime session.
+    
+    Works for both exported graphs: lstm_model.onnx (sequence input) and
+    lstm_vector.onnx (vector input).
+    
+    All graph optimizations (constant folding, node fusion, layout
+    transforms) are enabled, and the session runs on the CPU execution
+    provider, so the inference service does not need TensorFlow at all.
+    
+    Args:
+        model_path (str): Path to the .onnx file
+        intra_op_threads (int, optional): Threads per operator (default: ORT's choice)
+        
+    Returns:
+        tuple: (onnxruntime.InferenceSession, inference callable)
+    """
+    import numpy as np
+    import onnxruntime as ort
+    
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    
+    def infer(x):
+        return session.run(None, {input_name: np.asarray(x, dtype=np.float32)})[0]
+    
+    logger.info(f"LSTM ONNX session created from {model_path}")
+    return session, infer
+
+
+def triton_lstm_inference(url, model_name='lstm'):
+    """
+    Connect to an LSTM served by Triton Inference Server over gRPC.
+    
+    The model is the exported ONNX graph from a repository written by
+    scripts/export_triton.py. Triton's dynamic batcher merges calls from all
+    API workers (and hosts) into larger batches on the server, and the
+    model runs outside the API process entirely.
+    
+    Triton clients must not be shared between threads, so each inference
+    thread lazily opens its own connection. Batches larger than the model's
+    max_batch_size (the service pads to the next power of two) are sent as
+    several requests.
+    
+    Args:
+        url (str): Triton gRPC endpoint (host:port)
+        model_name (str): Model name in the repository ('lstm' or 'lstm_vector')
+        
+    Returns:
+        tuple: (tritonclient.grpc.InferenceServerClient used for the checks,
+                inference callable)
+        
+    Raises:
+        RuntimeError: If the server or the model is not ready
+    """
+    import numpy as np
+    import tritonclient.grpc as grpcclient
+    
+    client = grpcclient.InferenceServerClient(url=url)
+    if not client.is_model_ready(model_name):
+        raise RuntimeError(f"Triton model '{model_name}' is not ready at {url}")
+    metadata = client.get_model_metadata(model_name)
+    input_name = metadata.inputs[0].name
+    output_name = metadata.outputs[0].name
+    max_batch = client.get_model_config(model_name).config.max_batch_size
+    local = threading.local()
+    
+    def infer_chunk(thread_client, x):
+        request_input = grpcclient.InferInput(input_name, list(x.shape), 'FP32')
+        request_input.set_data_from_numpy(x)
+        result = thread_client.infer(
+            model_name, [request_input], outputs=[grpcclient.InferRequestedOutput(output_name)]
+        )
+        return result.as_numpy(output_name)
+    
+    def infer(x):
+        thread_client = getattr(local, 'client', None)
+        if thread_client is None:
+            thread_client = local.client = grpcclient.InferenceServerClient(url=url)
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        if max_batch and len(x) > max_batch:
+            # Triton rejects requests above max_batch_size
+            return np.concatenate([
+                infer_chunk(thread_client, x[start:start + max_batch])
+                for start in range(0, len(x), max_batch)
+            ])
+        return infer_chunk(thread_client, x)
+    
+    logger.info(f"LSTM served by Triton model '{model_name}' at {url} (max batch {max_batch or 'unlimited'})")
+    return client, infer
+
+
+def compile_xgb_inference(booster, max_rows=16):
+    """
+    Flatten an XGBoost binary classifier into node arrays for small-batch scoring.
+    
+    XGBoost's inplace_predict pays a fixed ~0.2 ms per call (argument
+    marshalling, thread dispatch) before walking any tree, which dominates
+    when the API scores one or a few transactions. Here every tree is padded
+    to the same node count and stored in flat arrays (split feature,
+    threshold, children, missing-value direction, leaf value), so a batch
+    walks all trees at once - one vectorized NumPy step per tree level.
+    Leaves point to themselves, so every row can take the same number of
+    steps. Above max_rows the per-level fancy indexing loses to XGBoost's
+    native traversal, so larger batches go to inplace_predict.
+    
+    Args:
+        booster (xgb.Booster): Trained booster with a binary:logistic objective
+        max_rows (int): Largest batch scored by the compiled arrays
+        
+    Returns:
+        Callable: Function mapping a (batch, features) float32 array to a
+                  (batch,) numpy array of fraud probabilities
+        
+    Raises:
+        ValueError: If the model uses features the arrays cannot represent
+                    (other objectives, categorical splits, multiple outputs
+                    or parallel trees)
+    """
+    import json
+    import numpy as np
+    
+    learner = json.loads(booster.save_raw('json'))['learner']
+    model = learner['gradient_booster'].get('model')
+    objective = learner['objective']['name']
+    if model is None or objective not in ('binary:logistic', 'reg:logistic'):
+        raise ValueError(f"Unsupported XGBoost model ({learner['gradient_booster']['name']}, {objective})")
+    if int(learner['learner_model_param'].get('num_target', 1)) != 1 or \
+       int(model['gbtree_model_param'].get('num_parallel_tree', 1)) != 1:
+        raise ValueError("Only single-output boosters with one tree per round are supported")
+    trees = model['trees']
+    if any(tree.get('categories_nodes') for tree in trees):
+        raise ValueError("Categorical splits are not supported")
+    
+    n_trees = len(trees)
+    n_nodes = max(len(tree['left_children']) for tree in trees)
+    feature = np.zeros((n_trees, n_nodes), dtype=np.intp)
+    threshold = np.zeros((n_trees, n_nodes), dtype=np.float32)
+    left = np.tile(np.arange(n_nodes), (n_trees, 1))
+    right = left.copy()
+    default_left = np.zeros((n_trees, n_nodes), dtype=bool)
+    value = np.zeros((n_trees, n_nodes), dtype=np.float32)
+    depth = 0
+    for t, tree in enumerate(trees):
+        children_left = np.asarray(tree['left_children'])
+        children_right = np.asarray(tree['right_children'])
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        n = len(children_left)
+        ids = np.arange(n)
+        is_split = children_left != -1
+        # A leaf's split_condition holds its output value
+        feature[t, :n] = np.where(is_split, tree['split_indices'], 0)
+        threshold[t, :n] = conditions
+        left[t, :n] = np.where(is_split, children_left, ids)
+        right[t, :n] = np.where(is_split, children_right, ids)
+        default_left[t, :n] = np.asarray(tree['default_left'], dtype=bool)
+        value[t, :n] = np.where(is_split, 0, conditions)
+        # Children always follow their parent, so depths fill in one pass
+        node_depth = np.zeros(n, dtype=int)
+        for i in ids[is_split]:
+            node_depth[children_left[i]] = node_depth[children_right[i]] = node_depth[i] + 1
+        depth = max(depth, int(node_depth.max()))
+    
+    # Node ids become indices into the flattened arrays
+    roots = np.arange(n_trees) * n_nodes
+    left = (left + roots[:, None]).ravel()
+    right = (right + roots[:, None]).ravel()
+    feature, threshold, default_left, value = (
+        a.ravel() for a in (feature, threshold, default_left, value)
+    )
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    base_margin = np.float32(np.log(base_score / (1 - base_score)))
+    
+    def infer(x):
+        x = np.asarray(x, dtype=np.float32)
+        if len(x) > max_rows:
+            return booster.inplace_predict(x)
+        flat = x.reshape(-1)
+        row_offsets = (np.arange(len(x)) * x.shape[1])[:, None]
+        has_missing = np.isnan(flat).any()
+        node = np.tile(roots, (len(x), 1))
+        for _ in range(depth):
+            v = flat[row_offsets + feature[node]]
+            go_left = v < threshold[node]
+            if has_missing:
+                go_left |= np.isnan(v) & default_left[node]
+            node = np.where(go_left, left[node], right[node])
+        margin = value[node].sum(axis=1, dtype=np.float32) + base_margin
+        return 1 / (1 + np.exp(-margin))
+    
+    logger.info(f"XGBoost model compiled to node arrays ({n_trees} trees, depth {depth})")
+    return infer
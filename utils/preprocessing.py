@@ -21,9 +21,9 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler, LabelEncoder
 import joblib
-import yaml
 import os
 from .logger import setup_logger
+from .config import load_yaml_config
 
 logger = setup_logger()
 
@@ -44,6 +44,8 @@ class Preprocessor:
         scalers (dict): Dictionary of fitted scalers for numerical features
         encoders (dict): Dictionary of fitted encoders for categorical features
         feature_names (list): Ordered list of feature names
+        category_codes (dict): Per categorical column, label -> integer code
+            (built from the encoders for transform_single)
     """
     
     def __init__(self, config_path="07_configs/config.yaml"):
@@ -54,12 +56,15 @@ class Preprocessor:
             config_path (str): Path to the YAML configuration file.
                              Defaults to "07_configs/config.yaml".
         """
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_yaml_config(config_path)
         
         self.scalers = {}
         self.encoders = {}
         self.feature_names = []
+        self.category_codes = None
+        self._affine = None
+        self._category_tables = None
+        self._clip = None
     
     def feature_engineering(self, df):
         """
@@ -134,6 +139,7 @@ class Preprocessor:
         self.scalers['scaler'] = scaler
         
         self.feature_names = num_cols + self.config['features']['categorical']
+        self.category_codes = None  # Rebuilt from the new encoders on the next transform_single
         
         # Save artifacts
         self.save_artifacts()
@@ -151,7 +157,8 @@ class Preprocessor:
                 Required keys match the config features (numerical + categorical).
         
         Returns:
-            np.ndarray: Flattened array of encoded and scaled features.
+            np.ndarray: Flattened float32 array of encoded and scaled features
+                (the dtype both models are trained and served with).
         
         Raises:
             ValueError: If required features are missing from data_dict.
@@ -177,26 +184,53 @@ class Preprocessor:
         # Load artifacts if not in memory
         if not self.encoders:
             self.load_artifacts()
+        if self.category_codes is None:
+            self._build_lookup_tables()
         
-        # 1. Encode Categorical
-        cat_features = []
-        for col in self.config['features']['categorical']:
+        # 1. Scale Numerical (the fitted MinMaxScaler as per-column multiply-adds on plain floats -
+        # for a handful of columns this beats building NumPy temporaries)
+        # Note: In real-time, diff features (TimeDiff, AmountDiff) need history.
+        # For this demo, we assume they are provided or default to 0.
+        values = [float(data_dict.get(col, 0)) * scale + offset for col, scale, offset in self._affine]
+        if self._clip is not None:
+            low, high = self._clip
+            values = [min(max(value, low), high) for value in values]
+        
+        # 2. Encode Categorical (dictionary lookup instead of LabelEncoder.transform)
+        for col, codes in self._category_tables:
             val = str(data_dict.get(col, ''))
-            try:
+            encoded_val = codes.get(val)
+            if encoded_val is None:
                 # Handle unseen labels carefully
-                encoded_val = self.encoders[col].transform([val])[0]
-            except (KeyError, ValueError):
                 logger.warning(f"Unseen label '{val}' in column '{col}', defaulting to 0")
                 encoded_val = 0
-            cat_features.append(encoded_val)
-        
-        # 2. Scale Numerical
-        # Note: In real-time, diff features (TimeDiff, AmountDiff) need history.
-        # For this demo, we assume they are provided or default to 0.
-        num_vals = [data_dict.get(col, 0) for col in self.config['features']['numerical']]
-        num_scaled = self.scalers['scaler'].transform([num_vals])[0]
+            values.append(encoded_val)
         
-        return np.concatenate([num_scaled, cat_features])
+        return np.array(values, dtype=np.float32)
+    
+    def _build_lookup_tables(self):
+        """
+        Flatten the fitted encoders and scaler into plain lookup tables.
+        
+        LabelEncoder and MinMaxScaler validate and convert their input on every
+        call, which dominates the cost of transforming one row. Their fitted
+        state is just a sorted class list and a per-column scale/offset, so
+        transform_single uses these directly: (column, scale, offset) triples
+        for the numerical features and (column, label -> code) pairs for the
+        categorical ones, in feature order.
+        """
+        self.category_codes = {
+            col: {label: code for code, label in enumerate(encoder.classes_)}
+            for col, encoder in self.encoders.items()
+        }
+        scaler = self.scalers['scaler']
+        self._affine = tuple(zip(
+            self.config['features']['numerical'], scaler.scale_.tolist(), scaler.min_.tolist()
+        ))
+        self._category_tables = tuple(
+            (col, self.category_codes.get(col, {})) for col in self.config['features']['categorical']
+        )
+        self._clip = scaler.feature_range if getattr(scaler, 'clip', False) else None
     
     def create_sequences(self, df, lookback=None):
         """
@@ -249,37 +283,47 @@ class Preprocessor:
         
         return np.array(X_lstm), np.array(X_xgb), np.array(y)
     
-    def save_artifacts(self):
+    def save_artifacts(self, path=None):
         """
         Save fitted preprocessing artifacts to disk.
         
         Saves encoders, scalers, and feature names so they can be loaded
         during inference to ensure consistent transformations.
         
+        Args:
+            path (str, optional): Target directory. Defaults to the configured
+                                  artifacts directory.
+        
         Example:
             >>> preprocessor.fit_transform(df_train)
             >>> preprocessor.save_artifacts()
             # Artifacts saved to 02_models/artifacts/
         """
-        os.makedirs(self.config['paths']['artifacts'], exist_ok=True)
-        joblib.dump(self.encoders, os.path.join(self.config['paths']['artifacts'], 'label_encoders.pkl'))
-        joblib.dump(self.scalers['scaler'], os.path.join(self.config['paths']['artifacts'], 'scaler.pkl'))
-        joblib.dump(self.feature_names, os.path.join(self.config['paths']['artifacts'], 'feature_names.pkl'))
+        path = path or self.config['paths']['artifacts']
+        os.makedirs(path, exist_ok=True)
+        joblib.dump(self.encoders, os.path.join(path, 'label_encoders.pkl'))
+        joblib.dump(self.scalers['scaler'], os.path.join(path, 'scaler.pkl'))
+        joblib.dump(self.feature_names, os.path.join(path, 'feature_names.pkl'))
         logger.info("Artifacts saved.")
     
-    def load_artifacts(self):
+    def load_artifacts(self, path=None):
         """
         Load fitted preprocessing artifacts from disk.
         
         Loads previously saved encoders, scalers, and feature names for use
         during inference.
         
+        Args:
+            path (str, optional): Source directory. Defaults to the configured
+                                  artifacts directory.
+        
         Example:
             >>> preprocessor = Preprocessor()
             >>> preprocessor.load_artifacts()
             >>> features = preprocessor.transform_single(transaction)
         """
-        path = self.config['paths']['artifacts']
+        path = path or self.config['paths']['artifacts']
         self.encoders = joblib.load(os.path.join(path, 'label_encoders.pkl'))
         self.scalers['scaler'] = joblib.load(os.path.join(path, 'scaler.pkl'))
         self.feature_names = joblib.load(os.path.join(path, 'feature_names.pkl'))
+        self.category_codes = None  # Rebuilt from the loaded encoders on the next transform_single
@@ -9,11 +9,14 @@ It handles:
 - Model integrity validation
 
 Example:
-    from utils.security import calculate_checksum, validate_model_integrity
+    from utils.security import calculate_checksum, cached_checksum, validate_model_integrity
     
     # Calculate checksum
     checksum = calculate_checksum('model.pkl')
     
+    # Same value, re-read only when the file changed since the last call
+    checksum = cached_checksum('model.pkl')
+    
     # Validate model integrity
     is_valid = validate_model_integrity('model.pkl', expected_checksum)
 """
@@ -28,6 +31,9 @@ from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Bytes hashed per read - large reads keep hashing I/O-bound rather than call-bound
+CHECKSUM_CHUNK_SIZE = 1 << 20
+
 
 class ModelSecurityError(Exception):
     """Custom exception for model security violations."""
@@ -162,7 +168,7 @@ def calculate_checksum(file_path: str, algorithm: str = 'sha256') -> str:
     # Read file in chunks to handle large files efficiently
     try:
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
+            for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b''):
                 hasher.update(chunk)
     except IOError as e:
         raise IOError(f"Failed to read file {file_path}: {str(e)}")
@@ -170,10 +176,68 @@ def calculate_checksum(file_path: str, algorithm: str = 'sha256') -> str:
     return hasher.hexdigest()
 
 
+def cached_checksum(file_path: str, algorithm: str = 'sha256') -> str:
+    """
+    Calculate a file's checksum, reusing the last result if the file is unchanged.
+    
+    The digest is stored in a sidecar file (<file>.<algorithm>.cache) together
+    with the file's device, inode, size, mtime and ctime. When all of these
+    still match, the stored digest is returned without reading the file. The
+    ctime cannot be set back by utime(), so rewriting a file in place and
+    restoring its mtime still invalidates the entry. If the sidecar cannot be
+    written (e.g. a read-only artifacts mount) the checksum is simply
+    recomputed each time.
+    
+    Args:
+        file_path (str): Path to the file to hash
+        algorithm (str): Hash algorithm to use (see calculate_checksum)
+    
+    Returns:
+        str: Hexadecimal string of the file hash
+        
+    Raises:
+        FileNotFoundError: If file does not exist
+        ValueError: If unsupported algorithm specified
+    
+    Example:
+        >>> cached_checksum('model.pkl')  # hashes the file
+        'a1b2c3d4e5f6...'
+        >>> cached_checksum('model.pkl')  # only stats it
+        'a1b2c3d4e5f6...'
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    st = os.stat(file_path)
+    fingerprint = [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+    cache_path = f"{file_path}.{algorithm}.cache"
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached.get('stat') == fingerprint and cached.get(algorithm):
+            return cached[algorithm]
+    except (OSError, ValueError, AttributeError):
+        # Missing or unreadable cache entry - recompute
+        pass
+    
+    checksum = calculate_checksum(file_path, algorithm)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'stat': fingerprint, algorithm: checksum}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Checksum cache not written for {file_path}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return checksum
+
+
 def validate_model_integrity(
     file_path: str, 
     expected_checksum: str,
-    algorithm: str = 'sha256'
+    algorithm: str = 'sha256',
+    use_cache: bool = False
 ) -> bool:
     """
     Validate the integrity of a model file.
@@ -185,6 +249,8 @@ def validate_model_integrity(
         file_path (str): Path to the model file
         expected_checksum (str): Expected checksum value
         algorithm (str): Hash algorithm used for checksum
+        use_cache (bool): Reuse the digest from the last check if the file is
+                          unchanged (see cached_checksum)
         
     Returns:
         bool: True if checksums match, False otherwise
@@ -201,7 +267,8 @@ def validate_model_integrity(
         ...     print("Model integrity verified")
     """
     try:
-        actual_checksum = calculate_checksum(file_path, algorithm)
+        checksum = cached_checksum if use_cache else calculate_checksum
+        actual_checksum = checksum(file_path, algorithm)
         is_valid = actual_checksum.lower() == expected_checksum.lower()
         
         if not is_valid:
@@ -419,6 +486,8 @@ class SecureModelLoader:
         models_dir (str): Directory containing model files
         checksums (Dict[str, str]): Loaded checksums dictionary
         verify_checksums (bool): Whether to enforce checksum verification
+        cache_checksums (bool): Whether to reuse digests of unchanged files
+            across loads (see cached_checksum)
         
     Example:
         >>> loader = SecureModelLoader('02_models/artifacts', 'checksums.json')
@@ -429,7 +498,8 @@ class SecureModelLoader:
         self, 
         models_dir: str,
         checksums_file: Optional[str] = None,
-        verify_checksums: bool = True
+        verify_checksums: bool = True,
+        cache_checksums: bool = False
     ):
         """
         Initialize the secure model loader.
@@ -438,9 +508,11 @@ class SecureModelLoader:
             models_dir (str): Directory containing model files
             checksums_file (Optional[str]): Path to checksums JSON file
             verify_checksums (bool): Whether to enforce checksum verification
+            cache_checksums (bool): Whether to reuse digests of unchanged files
         """
         self.models_dir = models_dir
         self.verify_checksums = verify_checksums
+        self.cache_checksums = cache_checksums
         self.checksums = {}
         
         if checksums_file and os.path.exists(checksums_file):
@@ -480,11 +552,12 @@ class SecureModelLoader:
         # Verify checksum if available and verification enabled
         expected_checksum = self.checksums.get(model_name)
         if self.verify_checksums and expected_checksum:
-            if not validate_model_integrity(model_path, expected_checksum):
+            if not validate_model_integrity(model_path, expected_checksum, use_cache=self.cache_checksums):
                 raise ValueError(
                     f"Model integrity check failed for {model_name}. "
                     f"The file may be corrupted or tampered with."
                 )
+            expected_checksum = None  # Verified - don't hash the pickle a second time
         
         # Load based on file type
         if model_name.endswith('.pkl'):
@@ -493,9 +566,13 @@ class SecureModelLoader:
             else:
                 import joblib
                 return joblib.load(model_path)
-        elif model_name.endswith('.h5'):
+        elif model_name.endswith(('.h5', '.keras')):
             # Keras/TensorFlow models - no custom unpickler needed
             import tensorflow as tf
-            return tf.keras.models.load_model(model_path)
+            return tf.keras.models.load_model(model_path, compile=False)
+        elif model_name.endswith(('.ubj', '.json')):
+            # Native XGBoost model format - (binary) JSON, no code execution on load
+            import xgboost as xgb
+            return xgb.Booster(model_file=model_path)
         else:
             raise ValueError(f"Unsupported model format: {model_name}")